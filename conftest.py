@@ -1,8 +1,19 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
 import pytest
-from django.test import Client
-from django.contrib.auth.models import User
-from wiki.models import WikiPage, PageRevision, UserActivity
-from typing import Any
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+
+from wiki.models import Follow, PageRevision, UserActivity, WikiPage
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
 
 
 @pytest.fixture
@@ -11,27 +22,55 @@ def client() -> Client:
     return Client()
 
 
-@pytest.fixture
-def user(db: Any) -> User:
-    """Create a test user"""
-    # Temporarily disable signup signal
+@pytest.fixture(scope="session")
+def password_hashes() -> dict[str, str]:
+    """Hash the fixture passwords once per session rather than once per user"""
+    return {
+        password: make_password(password)
+        for password in ("testpass", "adminpass", "testpass2")
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _disable_signup_signal() -> Iterator[None]:
+    """Keep the signup signal disconnected for the whole session
+
+    Tests that exercise the signal opt back in with the signup_signal fixture.
+    """
     from wiki import signals
 
     signals.post_save.disconnect(signals.create_user_activity_on_signup, sender=User)
+    yield
+    signals.post_save.connect(signals.create_user_activity_on_signup, sender=User)
 
-    user = User.objects.create_user(username="testuser", password="testpass")
 
-    # Re-enable signal
+@pytest.fixture
+def signup_signal() -> Iterator[None]:
+    """Connect the signup signal for the duration of a test"""
+    from wiki import signals
+
     signals.post_save.connect(signals.create_user_activity_on_signup, sender=User)
+    yield
+    signals.post_save.disconnect(signals.create_user_activity_on_signup, sender=User)
 
-    return user
+
+@pytest.fixture
+def user(db: Any, password_hashes: dict[str, str]) -> User:
+    """Create a test user"""
+    return User.objects.create(
+        username="testuser", password=password_hashes["testpass"]
+    )
 
 
 @pytest.fixture
-def admin_user(db: Any) -> User:
+def admin_user(db: Any, password_hashes: dict[str, str]) -> User:
     """Create a test admin user"""
-    return User.objects.create_superuser(
-        username="admin", password="adminpass", email="admin@test.com"
+    return User.objects.create(
+        username="admin",
+        password=password_hashes["adminpass"],
+        email="admin@test.com",
+        is_staff=True,
+        is_superuser=True,
     )
 
 
@@ -66,18 +105,154 @@ def user_activity(db: Any, user: User) -> UserActivity:
 @pytest.fixture
 def logged_in_client(client: Client, user: User) -> Client:
     """Provide a client logged in as test user"""
-    client.login(username="testuser", password="testpass")
+    client.force_login(user)
     return client
 
 
 @pytest.fixture
 def logged_in_admin_client(client: Client, admin_user: User) -> Client:
     """Provide a client logged in as admin"""
-    client.login(username="admin", password="adminpass")
+    client.force_login(admin_user)
     return client
 
 
 @pytest.fixture
-def second_user(db: Any) -> User:
+def second_user(db: Any, password_hashes: dict[str, str]) -> User:
     """Create a second test user for permission tests"""
-    return User.objects.create_user(username="user2", password="testpass2")
+    return User.objects.create(username="user2", password=password_hashes["testpass2"])
+
+
+@pytest.fixture
+def third_user(make_user: Callable[..., User]) -> User:
+    """Create a third user, e.g. as a follow target"""
+    return make_user("user3")
+
+
+@pytest.fixture
+def fourth_user(make_user: Callable[..., User]) -> User:
+    """Create a fourth user, e.g. as a follow target"""
+    return make_user("user4")
+
+
+@pytest.fixture
+def make_user(db: Any, password_hashes: dict[str, str]) -> Callable[..., User]:
+    """Provide a factory for creating additional test users"""
+
+    def _make_user(username: str, password: str = "testpass") -> User:
+        if password not in password_hashes:
+            password_hashes[password] = make_password(password)
+        return User.objects.create(
+            username=username, password=password_hashes[password]
+        )
+
+    return _make_user
+
+
+@pytest.fixture
+def login_as(client: Client, make_user: Callable[..., User]) -> Callable[[str], User]:
+    """Provide a helper that creates a user and logs the test client in as them"""
+
+    def _login_as(username: str) -> User:
+        user = make_user(username)
+        client.force_login(user)
+        return user
+
+    return _login_as
+
+
+def _call_view(
+    request: HttpRequest,
+    view: Callable[..., HttpResponse],
+    user: User | AnonymousUser,
+    *args: Any,
+    **kwargs: Any,
+) -> HttpResponse:
+    """Call a view with a RequestFactory request as the given user
+
+    Messages are kept in cookie storage so views that call
+    django.contrib.messages still work without the middleware.
+    """
+    request.user = user
+    request._messages = CookieStorage(request)  # type: ignore[attr-defined]
+    return view(request, *args, **kwargs)
+
+
+@pytest.fixture
+def post_to_view(rf: RequestFactory) -> Callable[..., HttpResponse]:
+    """Provide a helper that POSTs straight to a view function as a given user
+
+    Skips URL routing and the middleware stack, for tests that only care about
+    the view's database side effects.
+    """
+
+    def _post_to_view(
+        view: Callable[..., HttpResponse],
+        user: User,
+        data: dict[str, Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponse:
+        return _call_view(rf.post("/", data), view, user, *args, **kwargs)
+
+    return _post_to_view
+
+
+@pytest.fixture
+def get_from_view(rf: RequestFactory) -> Callable[..., HttpResponse]:
+    """Provide a helper that GETs a view function directly as a given user
+
+    The read-only counterpart of post_to_view, for tests that only check that
+    a page renders. Pass AnonymousUser() to view a page logged out.
+    """
+
+    def _get_from_view(
+        view: Callable[..., HttpResponse],
+        user: User | AnonymousUser,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponse:
+        return _call_view(rf.get("/"), view, user, *args, **kwargs)
+
+    return _get_from_view
+
+
+@pytest.fixture
+def make_follows(db: Any) -> Callable[[Iterable[tuple[User, User]]], list[Follow]]:
+    """Provide a helper that creates (follower, following) pairs in one INSERT"""
+
+    def _make_follows(pairs: Iterable[tuple[User, User]]) -> list[Follow]:
+        return Follow.objects.bulk_create(
+            Follow(follower=follower, following=following)
+            for follower, following in pairs
+        )
+
+    return _make_follows
+
+
+@pytest.fixture
+def make_page(db: Any) -> Callable[[User, str, str], WikiPage]:
+    """Provide a helper that creates a page and its initial revision via the ORM
+
+    Mirrors what the create view stores, for tests that only need a page as
+    setup and do not exercise page creation itself.
+    """
+
+    def _make_page(author: User, title: str, content: str) -> WikiPage:
+        page = WikiPage.objects.create(title=title, content=content, author=author)
+        PageRevision.objects.create(
+            page=page, title=title, content=content, editor=author, is_current=True
+        )
+        return page
+
+    return _make_page
+
+
+@pytest.fixture(scope="session")
+def md() -> MarkdownIt:
+    """Provide a MarkdownIt parser with the wiki link plugin, shared by all tests"""
+    # Imported here so collecting tests that never render markdown stays cheap
+    from markdown_it import MarkdownIt
+
+    from wiki.markdown_extensions import wiki_link_plugin
+
+    return MarkdownIt().use(wiki_link_plugin)
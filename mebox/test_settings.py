@@ -0,0 +1,23 @@
+"""
+Django settings for running the mebox test suite.
+
+Imports the regular settings and overrides only what makes tests slow or
+environment-dependent.
+"""
+
+from .settings import *
+
+# Password hashing dominates user creation in tests; strength is irrelevant here
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# pytest-django already runs tests with DEBUG off; make it explicit so other
+# runners do not record every query in connection.queries
+DEBUG = False
+
+# Always test against an in-memory SQLite database. The WAL/fsync pragmas in
+# the regular settings only matter for the on-disk database.
+DATABASES["default"] = {
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": ":memory:",
+    "TEST": {"NAME": ":memory:"},
+}
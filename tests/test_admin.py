@@ -2,6 +2,10 @@
 Test cases for admin interface
 """
 
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from wiki.admin import WikiPageAdmin, PageRevisionAdmin, UserActivityAdmin
 from wiki.models import WikiPage, PageRevision, UserActivity
 
@@ -9,94 +13,100 @@ from wiki.models import WikiPage, PageRevision, UserActivity
 class TestAdminInterfaces:
     """Test admin interfaces"""
 
-    def test_wikipage_admin_list_display(self):
-        """Test WikiPageAdmin list_display"""
-        assert "title" in WikiPageAdmin.list_display
-        assert "author" in WikiPageAdmin.list_display
-        assert "created_at" in WikiPageAdmin.list_display
-        assert "updated_at" in WikiPageAdmin.list_display
-
-    def test_wikipage_admin_list_filter(self):
-        """Test WikiPageAdmin list_filter"""
-        assert "author" in WikiPageAdmin.list_filter
-        assert "created_at" in WikiPageAdmin.list_filter
-
-    def test_wikipage_admin_search_fields(self):
-        """Test WikiPageAdmin search_fields"""
-        assert "title" in WikiPageAdmin.search_fields
-        assert "content" in WikiPageAdmin.search_fields
-        assert "author__username" in WikiPageAdmin.search_fields
-
-    def test_pagerevision_admin_list_display(self):
-        """Test PageRevisionAdmin list_display"""
-        assert "page" in PageRevisionAdmin.list_display
-        assert "editor" in PageRevisionAdmin.list_display
-        assert "created_at" in PageRevisionAdmin.list_display
-        assert "is_current" in PageRevisionAdmin.list_display
-
-    def test_pagerevision_admin_list_filter(self):
-        """Test PageRevisionAdmin list_filter"""
-        assert "editor" in PageRevisionAdmin.list_filter
-        assert "created_at" in PageRevisionAdmin.list_filter
-        assert "is_current" in PageRevisionAdmin.list_filter
-
-    def test_pagerevision_admin_search_fields(self):
-        """Test PageRevisionAdmin search_fields"""
-        assert "page__title" in PageRevisionAdmin.search_fields
-        assert "editor__username" in PageRevisionAdmin.search_fields
-        assert "content" in PageRevisionAdmin.search_fields
-
-    def test_useractivity_admin_list_display(self):
-        """Test UserActivityAdmin list_display"""
-        assert "user" in UserActivityAdmin.list_display
-        assert "activity_type" in UserActivityAdmin.list_display
-        assert "created_at" in UserActivityAdmin.list_display
-        assert "page" in UserActivityAdmin.list_display
-
-    def test_useractivity_admin_list_filter(self):
-        """Test UserActivityAdmin list_filter"""
-        assert "activity_type" in UserActivityAdmin.list_filter
-        assert "created_at" in UserActivityAdmin.list_filter
-
-    def test_useractivity_admin_search_fields(self):
-        """Test UserActivityAdmin search_fields"""
-        assert "user__username" in UserActivityAdmin.search_fields
-        assert "page__title" in UserActivityAdmin.search_fields
-        assert "details" in UserActivityAdmin.search_fields
+    @pytest.mark.parametrize(
+        "admin_cls,expected",
+        [
+            pytest.param(
+                WikiPageAdmin,
+                {
+                    "list_display": ["title", "author", "created_at", "updated_at"],
+                    "list_filter": ["author", "created_at"],
+                    "search_fields": ["title", "author__username"],
+                },
+                id="wikipage",
+            ),
+            pytest.param(
+                PageRevisionAdmin,
+                {
+                    "list_display": ["page", "editor", "created_at", "is_current"],
+                    "list_filter": ["editor", "created_at", "is_current"],
+                    "search_fields": ["page__title", "editor__username"],
+                },
+                id="pagerevision",
+            ),
+            pytest.param(
+                UserActivityAdmin,
+                {
+                    "list_display": ["user", "activity_type", "created_at", "page"],
+                    "list_filter": ["activity_type", "created_at"],
+                    "search_fields": ["user__username", "page__title", "details"],
+                },
+                id="useractivity",
+            ),
+        ],
+    )
+    def test_admin_attributes(self, admin_cls, expected):
+        """Test list_display, list_filter and search_fields of each ModelAdmin"""
+        for attr, fields in expected.items():
+            got = getattr(admin_cls, attr)
+            for field in fields:
+                assert field in got, f"{field!r} missing from {attr}"
 
 
 class TestAdminViews:
     """Test admin views"""
 
-    def test_admin_wikipage_list(self, logged_in_admin_client):
-        """Test WikiPage admin list view"""
-        response = logged_in_admin_client.get("/admin/wiki/wikipage/")
-        assert response.status_code == 200
-
-    def test_admin_pagerevision_list(self, logged_in_admin_client):
-        """Test PageRevision admin list view"""
-        response = logged_in_admin_client.get("/admin/wiki/pagerevision/")
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/admin/wiki/wikipage/",
+            "/admin/wiki/pagerevision/",
+            "/admin/wiki/useractivity/",
+            "/admin/wiki/wikipage/add/",
+            "/admin/wiki/pagerevision/add/",
+            "/admin/wiki/useractivity/add/",
+        ],
+    )
+    def test_admin_wiki_model_views(self, logged_in_admin_client, url):
+        """Test the list and add views of every wiki ModelAdmin"""
+        response = logged_in_admin_client.get(url)
         assert response.status_code == 200
 
-    def test_admin_useractivity_list(self, logged_in_admin_client):
-        """Test UserActivity admin list view"""
-        response = logged_in_admin_client.get("/admin/wiki/useractivity/")
-        assert response.status_code == 200
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/admin/wiki/wikipage/",
+            "/admin/wiki/pagerevision/",
+            "/admin/wiki/useractivity/",
+        ],
+    )
+    def test_admin_changelist_query_count_is_constant(
+        self, logged_in_admin_client, make_user, make_page, url
+    ):
+        """Test that changelist rows don't each query their related objects"""
+        make_page(make_user("alice"), "Alice Page", "# Test")
+        with CaptureQueriesContext(connection) as fewer_rows:
+            logged_in_admin_client.get(url)
+
+        for username in ("bob", "carol"):
+            author = make_user(username)
+            page = make_page(author, f"{username} page", "# Test")
+            UserActivity.objects.create(
+                user=author, activity_type="create_page", page=page
+            )
+        with CaptureQueriesContext(connection) as more_rows:
+            response = logged_in_admin_client.get(url)
 
-    def test_admin_wikipage_add(self, logged_in_admin_client, user):
-        """Test WikiPage admin add view"""
-        response = logged_in_admin_client.get("/admin/wiki/wikipage/add/")
         assert response.status_code == 200
+        assert len(more_rows) == len(fewer_rows)
 
-    def test_admin_pagerevision_add(self, logged_in_admin_client, user, wiki_page):
-        """Test PageRevision admin add view"""
+    def test_admin_add_form_uses_autocomplete(self, logged_in_admin_client, make_user):
+        """Test that foreign key inputs don't list every user as an option"""
+        make_user("alice")
         response = logged_in_admin_client.get("/admin/wiki/pagerevision/add/")
         assert response.status_code == 200
-
-    def test_admin_useractivity_add(self, logged_in_admin_client, user):
-        """Test UserActivity admin add view"""
-        response = logged_in_admin_client.get("/admin/wiki/useractivity/add/")
-        assert response.status_code == 200
+        assert b"admin-autocomplete" in response.content
+        assert b">alice</option>" not in response.content
 
 
 class TestAdminPermissions:
@@ -112,21 +122,12 @@ class TestAdminPermissions:
         response = logged_in_admin_client.get("/admin/")
         assert response.status_code == 200
 
-    def test_admin_user_can_access_wiki_models(self, logged_in_admin_client):
-        """Test that admin users can access wiki models"""
-        models = ["wikipage", "pagerevision", "useractivity"]
-        for model in models:
-            response = logged_in_admin_client.get(f"/admin/wiki/{model}/")
-            assert response.status_code == 200, f"Failed for model {model}"
-
 
 class TestAdminModelActions:
     """Test admin model actions"""
 
     def test_admin_can_create_wikipage(self, logged_in_admin_client, user):
         """Test that admin can create WikiPage"""
-        initial_count = WikiPage.objects.count()
-
         response = logged_in_admin_client.post(
             "/admin/wiki/wikipage/add/",
             {
@@ -138,14 +139,12 @@ class TestAdminModelActions:
         )
 
         assert response.status_code == 302
-        assert WikiPage.objects.count() == initial_count + 1
+        assert WikiPage.objects.count() == 1
 
     def test_admin_can_create_pagerevision(
         self, logged_in_admin_client, user, wiki_page
     ):
         """Test that admin can create PageRevision"""
-        initial_count = PageRevision.objects.count()
-
         response = logged_in_admin_client.post(
             "/admin/wiki/pagerevision/add/",
             {
@@ -158,12 +157,10 @@ class TestAdminModelActions:
         )
 
         assert response.status_code == 302
-        assert PageRevision.objects.count() == initial_count + 1
+        assert PageRevision.objects.count() == 1
 
     def test_admin_can_create_useractivity(self, logged_in_admin_client, user):
         """Test that admin can create UserActivity"""
-        initial_count = UserActivity.objects.count()
-
         response = logged_in_admin_client.post(
             "/admin/wiki/useractivity/add/",
             {
@@ -174,4 +171,4 @@ class TestAdminModelActions:
         )
 
         assert response.status_code == 302
-        assert UserActivity.objects.count() == initial_count + 1
+        assert UserActivity.objects.count() == 1
@@ -2,23 +2,17 @@
 Test cases for cross-user wiki links
 """
 
-from django.contrib.auth.models import User
-from markdown_it import MarkdownIt
-
-from wiki.markdown_extensions import render_markdown_with_wiki_links, wiki_link_plugin
+from wiki.markdown_extensions import render_markdown_with_wiki_links
 from wiki.models import WikiPage
 
 
 class TestCrossUserLinks:
     """Test cross-user wiki link functionality"""
 
-    def test_cross_user_link_basic(self, db):
+    def test_cross_user_link_basic(self, md, make_user):
         """Test basic [[User:username/page]] syntax"""
         # Create a user so validation doesn't fail
-        User.objects.create_user(username="testuser", password="testpass")
-
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
+        make_user("testuser")
 
         result = md.render("This is a [[User:testuser/test_page]] link.")
 
@@ -27,13 +21,10 @@ class TestCrossUserLinks:
         assert 'data-wiki-link="test_page"' in result
         assert '<a href="/test_page.html"' in result
 
-    def test_cross_user_link_with_display_text(self, db):
+    def test_cross_user_link_with_display_text(self, md, make_user):
         """Test [[User:username/page|Display]] syntax"""
         # Create a user so validation doesn't fail
-        User.objects.create_user(username="testuser", password="testpass")
-
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
+        make_user("testuser")
 
         result = md.render("This is a [[User:testuser/test_page|Custom Text]] link.")
 
@@ -41,24 +32,21 @@ class TestCrossUserLinks:
         assert 'data-wiki-link="test_page"' in result
         assert "Custom Text" in result
 
-    def test_cross_user_link_with_spaces(self, db):
+    def test_cross_user_link_with_spaces(self, md, make_user):
         """Test that spaces in page title are converted to underscores"""
         # Create a user so validation doesn't fail
-        User.objects.create_user(username="testuser", password="testpass")
-
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
+        make_user("testuser")
 
         result = md.render("This is a [[User:testuser/Test Page]] link.")
 
         assert 'data-wiki-username="testuser"' in result
         assert 'data-wiki-link="Test_Page"' in result
 
-    def test_cross_user_link_validation_valid(self, db):
+    def test_cross_user_link_validation_valid(self, make_user):
         """Test that cross-user links are validated correctly"""
         # Create two users
-        _ = User.objects.create_user(username="user1", password="testpass")
-        user2 = User.objects.create_user(username="user2", password="testpass")
+        _ = make_user("user1")
+        user2 = make_user("user2")
 
         # Create a page for user2
         WikiPage.objects.create(
@@ -74,11 +62,11 @@ class TestCrossUserLinks:
         assert 'class="wiki-link-valid"' in result
         assert 'data-wiki-username="user2"' in result
 
-    def test_cross_user_link_validation_invalid(self, db):
+    def test_cross_user_link_validation_invalid(self, make_user):
         """Test that invalid cross-user links are marked as such"""
         # Create two users
-        _ = User.objects.create_user(username="user1", password="testpass")
-        user2 = User.objects.create_user(username="user2", password="testpass")
+        _ = make_user("user1")
+        user2 = make_user("user2")
 
         # Create a page for user2
         WikiPage.objects.create(
@@ -94,9 +82,9 @@ class TestCrossUserLinks:
         assert 'class="wiki-link-invalid"' in result
         assert 'data-wiki-username="user2"' in result
 
-    def test_cross_user_link_nonexistent_user(self, db):
+    def test_cross_user_link_nonexistent_user(self, make_user):
         """Test that links to non-existent users are marked as invalid"""
-        _ = User.objects.create_user(username="user1", password="testpass")
+        _ = make_user("user1")
 
         # Link to non-existent user
         result = render_markdown_with_wiki_links(
@@ -107,10 +95,10 @@ class TestCrossUserLinks:
         assert 'class="wiki-link-invalid"' in result
         assert 'data-wiki-username="nonexistent"' in result
 
-    def test_mixed_same_and_cross_user_links(self, db):
+    def test_mixed_same_and_cross_user_links(self, make_user):
         """Test that same-user and cross-user links can coexist"""
-        user1 = User.objects.create_user(username="user1", password="testpass")
-        user2 = User.objects.create_user(username="user2", password="testpass")
+        user1 = make_user("user1")
+        user2 = make_user("user2")
 
         # Create pages
         WikiPage.objects.create(
@@ -132,11 +120,31 @@ class TestCrossUserLinks:
         assert 'data-wiki-link="page1"' in result
         assert 'data-wiki-link="page2"' in result
 
-    def test_invalid_user_format(self):
-        """Test that invalid User: format is handled gracefully"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
+    def test_link_validation_query_count_is_constant(
+        self, make_user, django_assert_num_queries
+    ):
+        """Test that link existence checks are batched, not run per link"""
+        user1 = make_user("user1")
+        make_user("user2")
+        WikiPage.objects.create(
+            title="Page 1", slug="page1", content="# Test", author=user1
+        )
+
+        with django_assert_num_queries(1):
+            render_markdown_with_wiki_links("[[page1]]", "user1")
+
+        with django_assert_num_queries(1):
+            result = render_markdown_with_wiki_links(
+                "[[page1]] [[page2]] [[User:user2/page1]] "
+                "[[User:user2/page3]] [[User:nobody/page1]]",
+                "user1",
+            )
 
+        assert result.count('class="wiki-link-valid"') == 1
+        assert result.count('class="wiki-link-invalid"') == 4
+
+    def test_invalid_user_format(self, md):
+        """Test that invalid User: format is handled gracefully"""
         # Invalid format - no page specified
         result = md.render("This is a [[User:testuser]] link.")
 
@@ -146,11 +154,8 @@ class TestCrossUserLinks:
         assert 'data-wiki-link="testuser"' in result
         assert "User:testuser" in result  # Display text should be preserved
 
-    def test_user_colon_in_regular_link(self):
+    def test_user_colon_in_regular_link(self, md):
         """Test that User: in regular text doesn't create a cross-user link"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("This is just text with User:testuser in it.")
 
         # Should not create any wiki links
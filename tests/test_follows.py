@@ -1,8 +1,9 @@
 """Tests for follow functionality"""
 
+from functools import lru_cache
+
 import pytest
-from django.contrib.auth.models import User
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from wiki.models import (
     Follow,
     get_following,
@@ -11,6 +12,20 @@ from wiki.models import (
     get_mutual_follows,
 )
 
+ADD_FOLLOW_URL = reverse_lazy("add_follow")
+
+
+@lru_cache
+def profile_url(username: str) -> str:
+    """Reverse the profile URL for a username, once per username"""
+    return reverse("user_profile", args=[username])
+
+
+@lru_cache
+def remove_follow_url(user_id: int) -> str:
+    """Reverse the unfollow URL for a user id, once per id"""
+    return reverse("remove_follow", args=[user_id])
+
 
 @pytest.mark.django_db
 def test_follow_model_creation(user, second_user):
@@ -27,51 +42,40 @@ def test_follow_model_creation(user, second_user):
 
 
 @pytest.mark.django_db
-def test_get_following(user, second_user):
+def test_get_following(user, second_user, third_user, make_follows):
     """Test getting users that a user is following"""
-    # Create a third user
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-
     # Create follows
-    Follow.objects.create(follower=user, following=second_user)
-    Follow.objects.create(follower=user, following=user3)
+    make_follows([(user, second_user), (user, third_user)])
 
     # Get following for user
     following = get_following(user)
 
-    # Should return both second_user and user3
-    assert following.count() == 2
-    following_usernames = [f.username for f in following]
+    # Should return both second_user and third_user
+    following_usernames = list(following.values_list("username", flat=True))
+    assert len(following_usernames) == 2
     assert second_user.username in following_usernames
-    assert user3.username in following_usernames
+    assert third_user.username in following_usernames
 
 
 @pytest.mark.django_db
-def test_get_followers(user, second_user):
+def test_get_followers(user, second_user, third_user, make_follows):
     """Test getting users that follow a user"""
-    # Create a third user
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-
     # Create follows
-    Follow.objects.create(follower=user, following=second_user)
-    Follow.objects.create(follower=user3, following=second_user)
+    make_follows([(user, second_user), (third_user, second_user)])
 
     # Get followers for second_user
     followers = get_followers(second_user)
 
-    # Should return both user and user3
-    assert followers.count() == 2
-    follower_usernames = [f.username for f in followers]
+    # Should return both user and third_user
+    follower_usernames = list(followers.values_list("username", flat=True))
+    assert len(follower_usernames) == 2
     assert user.username in follower_usernames
-    assert user3.username in follower_usernames
+    assert third_user.username in follower_usernames
 
 
 @pytest.mark.django_db
-def test_is_following(user, second_user):
+def test_is_following(user, second_user, third_user):
     """Test checking if user is following another user"""
-    # Create a third user
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-
     # Create follow between user and second_user
     Follow.objects.create(follower=user, following=second_user)
 
@@ -81,34 +85,32 @@ def test_is_following(user, second_user):
     # Check that second_user is not following user
     assert not is_following(second_user, user)
 
-    # Check that user is not following user3
-    assert not is_following(user, user3)
-    assert not is_following(user3, user)
+    # Check that user is not following third_user
+    assert not is_following(user, third_user)
+    assert not is_following(third_user, user)
 
 
 @pytest.mark.django_db
-def test_get_mutual_follows(user, second_user):
+def test_get_mutual_follows(user, second_user, third_user, fourth_user, make_follows):
     """Test getting mutual follows between two users"""
-    # Create third and fourth users
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-    user4 = User.objects.create_user(username="user4", password="testpass4")
-
-    # Create follows: user follows user3 and user4
-    Follow.objects.create(follower=user, following=user3)
-    Follow.objects.create(follower=user, following=user4)
-
-    # Create follows: second_user follows user3 and user4
-    Follow.objects.create(follower=second_user, following=user3)
-    Follow.objects.create(follower=second_user, following=user4)
+    # Create follows: user and second_user both follow third_user and fourth_user
+    make_follows(
+        [
+            (user, third_user),
+            (user, fourth_user),
+            (second_user, third_user),
+            (second_user, fourth_user),
+        ]
+    )
 
     # Get mutual follows
     mutuals = get_mutual_follows(user, second_user)
 
-    # Should return both user3 and user4
-    assert mutuals.count() == 2
-    mutual_usernames = [f.username for f in mutuals]
-    assert user3.username in mutual_usernames
-    assert user4.username in mutual_usernames
+    # Should return both third_user and fourth_user
+    mutual_usernames = list(mutuals.values_list("username", flat=True))
+    assert len(mutual_usernames) == 2
+    assert third_user.username in mutual_usernames
+    assert fourth_user.username in mutual_usernames
 
 
 @pytest.mark.django_db
@@ -117,20 +119,18 @@ def test_add_follow_view(client, user, second_user):
     client.force_login(user)
 
     # POST to add_follow with second_user's username
-    response = client.post(
-        reverse("add_follow"), {"username": second_user.username}, follow=True
-    )
+    response = client.post(ADD_FOLLOW_URL, {"username": second_user.username})
 
     # Should redirect to user's profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Check that follow was created
     assert Follow.objects.filter(follower=user, following=second_user).exists()
 
     # Check that following is returned
     following = get_following(user)
-    assert following.count() == 1
-    assert second_user in following
+    assert list(following) == [second_user]
 
 
 @pytest.mark.django_db
@@ -139,15 +139,14 @@ def test_add_self_follow_fails(client, user):
     client.force_login(user)
 
     # Try to follow self
-    response = client.post(
-        reverse("add_follow"), {"username": user.username}, follow=True
-    )
+    response = client.post(ADD_FOLLOW_URL, {"username": user.username})
 
     # Should redirect to profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Should not create follow
-    assert Follow.objects.count() == 0
+    assert not Follow.objects.exists()
 
 
 @pytest.mark.django_db
@@ -156,15 +155,14 @@ def test_add_nonexistent_user_follow(client, user):
     client.force_login(user)
 
     # Try to follow non-existent user
-    response = client.post(
-        reverse("add_follow"), {"username": "nonexistentuser"}, follow=True
-    )
+    response = client.post(ADD_FOLLOW_URL, {"username": "nonexistentuser"})
 
     # Should redirect to profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Should not create follow
-    assert Follow.objects.count() == 0
+    assert not Follow.objects.exists()
 
 
 @pytest.mark.django_db
@@ -176,16 +174,17 @@ def test_remove_follow_view(client, user, second_user):
     Follow.objects.create(follower=user, following=second_user)
 
     # Verify follow exists
-    assert Follow.objects.count() == 1
+    assert Follow.objects.filter(follower=user, following=second_user).exists()
 
     # Remove the follow
-    response = client.post(reverse("remove_follow", args=[second_user.id]), follow=True)
+    response = client.post(remove_follow_url(second_user.id))
 
     # Should redirect to user's profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Check that follow was removed
-    assert Follow.objects.count() == 0
+    assert not Follow.objects.filter(follower=user, following=second_user).exists()
 
 
 @pytest.mark.django_db
@@ -194,42 +193,41 @@ def test_remove_non_follow(client, user, second_user):
     client.force_login(user)
 
     # Don't create a follow
-    assert Follow.objects.count() == 0
+    assert not Follow.objects.exists()
 
     # Try to remove second_user follow
-    response = client.post(reverse("remove_follow", args=[second_user.id]), follow=True)
+    response = client.post(remove_follow_url(second_user.id))
 
     # Should redirect to profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Should still have no follows
-    assert Follow.objects.count() == 0
+    assert not Follow.objects.exists()
 
 
 @pytest.mark.django_db
-def test_profile_page_shows_following(client, user, second_user):
+def test_profile_page_shows_following(
+    client, user, second_user, third_user, make_follows
+):
     """Test that profile page shows following"""
     client.force_login(user)
 
-    # Create a third user
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-
     # Create follows
-    Follow.objects.create(follower=user, following=second_user)
-    Follow.objects.create(follower=user, following=user3)
+    make_follows([(user, second_user), (user, third_user)])
 
     # Visit profile page
-    response = client.get(reverse("user_profile", args=[user.username]))
+    response = client.get(profile_url(user.username))
 
     # Check response
     assert response.status_code == 200
 
     # Check that following is in context
     assert "following" in response.context
-    assert response.context["following"].count() == 2
     following_usernames = [f.username for f in response.context["following"]]
+    assert len(following_usernames) == 2
     assert second_user.username in following_usernames
-    assert user3.username in following_usernames
+    assert third_user.username in following_usernames
 
 
 @pytest.mark.django_db
@@ -238,7 +236,7 @@ def test_profile_page_shows_follow_status(client, user, second_user):
     client.force_login(user)
 
     # Visit second_user's profile (not following yet)
-    response = client.get(reverse("user_profile", args=[second_user.username]))
+    response = client.get(profile_url(second_user.username))
 
     # Check that is_following is False
     assert response.status_code == 200
@@ -249,7 +247,7 @@ def test_profile_page_shows_follow_status(client, user, second_user):
     Follow.objects.create(follower=user, following=second_user)
 
     # Visit second_user's profile again
-    response = client.get(reverse("user_profile", args=[second_user.username]))
+    response = client.get(profile_url(second_user.username))
 
     # Check that is_following is now True
     assert response.status_code == 200
@@ -262,7 +260,7 @@ def test_add_follow_form_in_context(client, user, second_user):
     client.force_login(user)
 
     # Visit second_user's profile
-    response = client.get(reverse("user_profile", args=[second_user.username]))
+    response = client.get(profile_url(second_user.username))
 
     # Check that add_follow_form is in context
     assert response.status_code == 200
@@ -278,54 +276,43 @@ def test_cannot_add_duplicate_follow(client, user, second_user):
     Follow.objects.create(follower=user, following=second_user)
 
     # Try to follow the same user again
-    response = client.post(
-        reverse("add_follow"), {"username": second_user.username}, follow=True
-    )
+    response = client.post(ADD_FOLLOW_URL, {"username": second_user.username})
 
     # Should redirect to profile
-    assert response.status_code == 200
+    assert response.status_code == 302
+    assert response.url == profile_url(user.username)
 
     # Should still only have one follow
     assert Follow.objects.count() == 1
 
 
 @pytest.mark.django_db
-def test_mutual_follows_display(client, user, second_user):
+def test_mutual_follows_display(client, user, second_user, third_user, make_follows):
     """Test that mutual follows are displayed correctly"""
     client.force_login(user)
 
-    # Create third user
-    user3 = User.objects.create_user(username="user3", password="testpass3")
-
-    # Create follows: user follows user3
-    Follow.objects.create(follower=user, following=user3)
-
-    # Create follows: second_user follows user3
-    Follow.objects.create(follower=second_user, following=user3)
+    # Create follows: user and second_user both follow third_user
+    make_follows([(user, third_user), (second_user, third_user)])
 
     # Visit second_user's profile
-    response = client.get(reverse("user_profile", args=[second_user.username]))
+    response = client.get(profile_url(second_user.username))
 
     # Check that mutual_follows is in context
     assert response.status_code == 200
     assert "mutual_follows" in response.context
-    assert response.context["mutual_follows"].count() == 1
-    assert user3 in response.context["mutual_follows"]
+    assert list(response.context["mutual_follows"]) == [third_user]
 
 
 @pytest.mark.django_db
-def test_mutual_follows_bidirectional(client, user, second_user):
+def test_mutual_follows_bidirectional(client, user, second_user, make_follows):
     """Test that mutual follows are shown when two users follow each other"""
     client.force_login(user)
 
-    # Create follows: user follows second_user
-    Follow.objects.create(follower=user, following=second_user)
-
-    # Create follows: second_user follows user (mutual)
-    Follow.objects.create(follower=second_user, following=user)
+    # Create follows: user and second_user follow each other (mutual)
+    make_follows([(user, second_user), (second_user, user)])
 
     # Visit second_user's profile
-    response = client.get(reverse("user_profile", args=[second_user.username]))
+    response = client.get(profile_url(second_user.username))
 
     # Check that both is_following and is_followed_by are True
     assert response.status_code == 200
@@ -334,7 +321,7 @@ def test_mutual_follows_bidirectional(client, user, second_user):
 
     # Visit user's profile from second_user's perspective
     client.force_login(second_user)
-    response = client.get(reverse("user_profile", args=[user.username]))
+    response = client.get(profile_url(user.username))
 
     # Check that both is_following and is_followed_by are True
     assert response.status_code == 200
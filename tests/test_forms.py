@@ -2,53 +2,40 @@
 Test cases for wiki forms
 """
 
+import pytest
+
 from wiki.forms import WikiPageForm
 
 
 class TestWikiPageForm:
     """Test WikiPageForm"""
 
-    def test_wikipageform_valid_data(self):
-        """Test WikiPageForm with valid data"""
-        form_data = {"title": "Test Page", "content": "# Test Content"}
-        form = WikiPageForm(data=form_data)
-        assert form.is_valid()
-
-    def test_wikipageform_required_fields(self):
-        """Test WikiPageForm validates required fields"""
-        form = WikiPageForm(data={})
-        assert not form.is_valid()
-        assert "title" in form.errors
-        assert "content" in form.errors
-
-    def test_wikipageform_title_field(self):
-        """Test WikiPageForm title field"""
-        form_data = {"title": "Test Page", "content": "# Test Content"}
-        form = WikiPageForm(data=form_data)
-        assert form.is_valid()
-        assert form.cleaned_data["title"] == "Test Page"
-
-    def test_wikipageform_content_field(self):
-        """Test WikiPageForm content field"""
-        form_data = {"title": "Test Page", "content": "# Test Content"}
-        form = WikiPageForm(data=form_data)
-        assert form.is_valid()
-        assert form.cleaned_data["content"] == "# Test Content"
-
-    def test_wikipageform_long_title(self):
-        """Test WikiPageForm with long title"""
-        long_title = "A" * 201  # Exceeds max_length
-        form_data = {"title": long_title, "content": "# Test Content"}
-        form = WikiPageForm(data=form_data)
-        assert not form.is_valid()
-        assert "title" in form.errors
-
-    def test_wikipageform_empty_content(self):
-        """Test WikiPageForm with empty content"""
-        form_data = {"title": "Test Page", "content": ""}
+    @pytest.mark.parametrize(
+        "form_data,error_fields",
+        [
+            pytest.param(
+                {"title": "Test Page", "content": "# Test Content"}, [], id="valid"
+            ),
+            pytest.param({}, ["title", "content"], id="required_fields"),
+            pytest.param(
+                # Exceeds max_length
+                {"title": "A" * 201, "content": "# Test Content"},
+                ["title"],
+                id="long_title",
+            ),
+            pytest.param(
+                {"title": "Test Page", "content": ""}, ["content"], id="empty_content"
+            ),
+        ],
+    )
+    def test_wikipageform_validation(self, form_data, error_fields):
+        """Test WikiPageForm accepts valid data and flags the invalid fields"""
         form = WikiPageForm(data=form_data)
-        assert not form.is_valid()
-        assert "content" in form.errors
+        assert form.is_valid() == (not error_fields)
+        assert sorted(form.errors) == sorted(error_fields)
+        if not error_fields:
+            assert form.cleaned_data["title"] == form_data["title"]
+            assert form.cleaned_data["content"] == form_data["content"]
 
     def test_wikipageform_markdown_content(self):
         """Test WikiPageForm accepts markdown content"""
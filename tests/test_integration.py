@@ -3,8 +3,8 @@ Integration tests for wiki functionality
 """
 
 import pytest
-from django.contrib.auth.models import User
 from wiki.models import WikiPage, PageRevision, UserActivity
+from wiki.views import edit_wiki_page
 
 
 class TestFullWorkflow:
@@ -23,14 +23,12 @@ class TestFullWorkflow:
             },
         )
         assert response.status_code == 302
-        assert UserActivity.objects.filter(activity_type="signup").exists()
 
         # Login
         response = client.post(
             "/login/", {"username": "workflowuser", "password": "testpass123"}
         )
         assert response.status_code == 302
-        assert UserActivity.objects.filter(activity_type="login").exists()
 
         # Create page
         response = client.post(
@@ -39,7 +37,6 @@ class TestFullWorkflow:
         assert response.status_code == 302
         page = WikiPage.objects.get(title="Workflow Test Page")
         assert PageRevision.objects.filter(page=page).count() == 1
-        assert UserActivity.objects.filter(activity_type="create_page").exists()
 
         # Edit page
         response = client.post(
@@ -48,7 +45,6 @@ class TestFullWorkflow:
         )
         assert response.status_code == 302
         assert PageRevision.objects.filter(page=page).count() == 2
-        assert UserActivity.objects.filter(activity_type="edit_page").exists()
 
         # View revisions
         response = client.get(f"/page/{page.id}/revisions/")
@@ -64,53 +60,73 @@ class TestFullWorkflow:
         assert response.status_code == 302
         page.refresh_from_db()
         assert page.content == "# Version 1"
-        assert UserActivity.objects.filter(activity_type="edit_page").count() >= 2
 
         # Delete page
         response = client.post(f"/delete/{page.id}/")
         assert response.status_code == 302
         assert not WikiPage.objects.filter(id=page.id).exists()
-        assert UserActivity.objects.filter(activity_type="delete_page").exists()
 
         # Verify activity feed
         response = client.get("/user/workflowuser/activity/")
         assert response.status_code == 200
-        assert (
-            UserActivity.objects.filter(user__username="workflowuser").count() >= 5
-        )  # signup, login, create, edit, delete
+
+        # Every step was logged: signup, login, create, edit + restore, delete
+        activity_types = list(
+            UserActivity.objects.filter(user__username="workflowuser").values_list(
+                "activity_type", flat=True
+            )
+        )
+        assert {"signup", "login", "create_page", "delete_page"} <= set(activity_types)
+        assert activity_types.count("edit_page") >= 2
 
 
 class TestMultiplePages:
     """Test handling multiple pages by same user"""
 
     @pytest.mark.django_db
-    def test_user_with_multiple_pages(self, client):
+    def test_user_with_multiple_pages(self, client, login_as):
         """Test that a user can create and manage multiple pages"""
-        # Signup and login
-        client.post(
-            "/signup/",
-            {
-                "username": "multipageuser",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
+        # Log in as a fresh user
+        user = login_as("multipageuser")
+
+        # Create two pages directly, with what the create view would store
+        pages = WikiPage.objects.bulk_create(
+            WikiPage(
+                title=f"Page {i}",
+                slug=f"page-{i}",
+                content=f"# Content {i}",
+                author=user,
+            )
+            for i in (1, 2)
         )
-        client.post("/login/", {"username": "multipageuser", "password": "testpass123"})
-
-        # Create multiple pages
-        for i in range(3):
-            response = client.post(
-                "/create/", {"title": f"Page {i + 1}", "content": f"# Content {i + 1}"}
+        PageRevision.objects.bulk_create(
+            PageRevision(
+                page=page,
+                title=page.title,
+                content=page.content,
+                editor=user,
+                is_current=True,
             )
-            assert response.status_code == 302
+            for page in pages
+        )
+        UserActivity.objects.bulk_create(
+            UserActivity(user=user, activity_type="create_page", page=page)
+            for page in pages
+        )
+
+        # Create the third page through the view
+        response = client.post(
+            "/create/", {"title": "Page 3", "content": "# Content 3"}
+        )
+        assert response.status_code == 302
 
         # Check that all pages exist
-        user = User.objects.get(username="multipageuser")
-        assert WikiPage.objects.filter(author=user).count() == 3
+        pages = list(WikiPage.objects.filter(author=user).prefetch_related("revisions"))
+        assert len(pages) == 3
 
         # Check that each page has a revision
-        for page in WikiPage.objects.filter(author=user):
-            assert PageRevision.objects.filter(page=page).count() >= 1
+        for page in pages:
+            assert len(page.revisions.all()) >= 1
 
         # Check that activity was logged for each creation
         assert (
@@ -130,97 +146,69 @@ class TestRevisionHistory:
     """Test comprehensive revision history functionality"""
 
     @pytest.mark.django_db
-    def test_extensive_revision_history(self, client):
+    def test_extensive_revision_history(
+        self, client, login_as, make_page, post_to_view
+    ):
         """Test that extensive editing creates proper revision history"""
-        # Signup and login
-        client.post(
-            "/signup/",
-            {
-                "username": "revisionuser",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
-        )
-        client.post("/login/", {"username": "revisionuser", "password": "testpass123"})
+        # Log in as a fresh user
+        user = login_as("revisionuser")
 
         # Create page
-        client.post("/create/", {"title": "Revision Test", "content": "# Version 1"})
-        page = WikiPage.objects.get(title="Revision Test")
-
-        # Edit multiple times
-        for i in range(5):
-            client.post(
-                f"/edit/{page.id}/",
-                {"title": "Revision Test", "content": f"# Version {i + 2}"},
+        page = make_page(user, "Revision Test", "# Version 1")
+
+        # Edit multiple times; once end to end, then straight through the view
+        client.post(
+            f"/edit/{page.id}/", {"title": "Revision Test", "content": "# Version 2"}
+        )
+        for i in range(3, 7):
+            response = post_to_view(
+                edit_wiki_page,
+                user,
+                {"title": "Revision Test", "content": f"# Version {i}"},
+                page.id,
             )
+            assert response.status_code == 302
 
         # Check that we have 6 revisions total (1 initial + 5 edits)
-        assert PageRevision.objects.filter(page=page).count() == 6
+        revisions = list(PageRevision.objects.filter(page=page))
+        assert len(revisions) == 6
 
         # Check that only the latest is marked as current
-        current_revisions = PageRevision.objects.filter(page=page, is_current=True)
-        assert current_revisions.count() == 1
-        current_rev = current_revisions.first()
-        assert current_rev is not None
-        assert current_rev.content == "# Version 6"
+        assert [r.content for r in revisions if r.is_current] == ["# Version 6"]
 
         # Check that we can view all revisions
         response = client.get(f"/page/{page.id}/revisions/")
         assert response.status_code == 200
 
         # Test restoring to middle version
-        middle_revision = PageRevision.objects.filter(
-            page=page, content="# Version 3"
-        ).first()
-        assert middle_revision is not None
+        middle_revision = next(r for r in revisions if r.content == "# Version 3")
         client.post(f"/page/{page.id}/revisions/{middle_revision.id}/restore/")
 
         page.refresh_from_db()
         assert page.content == "# Version 3"
 
         # Check that a new revision was created for the restoration
-        assert PageRevision.objects.filter(page=page).count() == 7
-        latest_revision = PageRevision.objects.filter(
-            page=page, is_current=True
-        ).first()
-        assert latest_revision is not None
-        assert latest_revision.content == "# Version 3"
+        revisions = list(PageRevision.objects.filter(page=page))
+        assert len(revisions) == 7
+        assert [r.content for r in revisions if r.is_current] == ["# Version 3"]
 
 
 class TestPermissionBoundary:
     """Test permission boundaries between users"""
 
     @pytest.mark.django_db
-    def test_users_cannot_interfere_with_each_other(self, client):
+    def test_users_cannot_interfere_with_each_other(self, client, make_user, make_page):
         """Test that users cannot access or modify each other's content"""
         # Create two users
-        client.post(
-            "/signup/",
-            {
-                "username": "user1",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
-        )
-        client.post(
-            "/signup/",
-            {
-                "username": "user2",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
-        )
+        user1 = make_user("user1")
+        user2 = make_user("user2")
 
-        # User1 creates a page
-        client.post("/login/", {"username": "user1", "password": "testpass123"})
-        client.post("/create/", {"title": "User1 Page", "content": "# User1 Content"})
-        page1 = WikiPage.objects.get(title="User1 Page")
+        # Each user has a page
+        page1 = make_page(user1, "User1 Page", "# User1 Content")
+        page2 = make_page(user2, "User2 Page", "# User2 Content")
 
-        # User2 creates a page
-        client.post("/logout/")
-        client.post("/login/", {"username": "user2", "password": "testpass123"})
-        client.post("/create/", {"title": "User2 Page", "content": "# User2 Content"})
-        page2 = WikiPage.objects.get(title="User2 Page")
+        # Log in as user2
+        client.force_login(user2)
 
         # User2 should not be able to edit User1's page
         response = client.get(f"/edit/{page1.id}/")
@@ -251,18 +239,10 @@ class TestDataIntegrity:
     """Test data integrity across operations"""
 
     @pytest.mark.django_db
-    def test_revision_integrity(self, client):
+    def test_revision_integrity(self, client, login_as):
         """Test that revision data remains intact across operations"""
-        # Signup and login
-        client.post(
-            "/signup/",
-            {
-                "username": "integrityuser",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
-        )
-        client.post("/login/", {"username": "integrityuser", "password": "testpass123"})
+        # Log in as a fresh user
+        login_as("integrityuser")
 
         # Create page with specific content
         original_content = """# Main Title
@@ -306,60 +286,56 @@ This is the second section.
         page.refresh_from_db()
         assert page.content == original_content.strip()
 
+        revisions = list(PageRevision.objects.filter(page=page))
+
         # Verify we can still access the edited version
-        edited_revision = PageRevision.objects.filter(
-            page=page, content__contains="**edited**"
-        ).first()
-        assert edited_revision is not None
-        assert "**edited**" in edited_revision.content
+        assert any("**edited**" in r.content for r in revisions)
 
         # Verify the current revision is marked correctly
-        current_revision = PageRevision.objects.filter(
-            page=page, is_current=True
-        ).first()
-        assert current_revision is not None
-        assert current_revision.content.strip() == original_content.strip()
+        current_revisions = [r for r in revisions if r.is_current]
+        assert len(current_revisions) == 1
+        assert current_revisions[0].content.strip() == original_content.strip()
 
 
 class TestPerformance:
     """Test performance with large datasets"""
 
     @pytest.mark.django_db
-    def test_many_revisions_performance(self, client):
+    def test_many_revisions_performance(
+        self, client, login_as, make_page, django_assert_max_num_queries
+    ):
         """Test that many revisions don't break the system"""
-        # Signup and login
-        client.post(
-            "/signup/",
-            {
-                "username": "performanceuser",
-                "password1": "testpass123",
-                "password2": "testpass123",
-            },
-        )
-        client.post(
-            "/login/", {"username": "performanceuser", "password": "testpass123"}
-        )
+        # Log in as a fresh user
+        user = login_as("performanceuser")
 
         # Create page
-        client.post("/create/", {"title": "Performance Test", "content": "# Version 1"})
-        page = WikiPage.objects.get(title="Performance Test")
-
-        # Create many revisions (50)
-        for i in range(2, 51):
-            client.post(
-                f"/edit/{page.id}/",
-                {"title": "Performance Test", "content": f"# Version {i}"},
+        page = make_page(user, "Performance Test", "# Version 1")
+
+        # Create many revisions (50) directly; the edit view is exercised below
+        PageRevision.objects.filter(page=page, is_current=True).update(is_current=False)
+        PageRevision.objects.bulk_create(
+            PageRevision(
+                page=page,
+                title="Performance Test",
+                content=f"# Version {i}",
+                editor=user,
+                is_current=i == 50,
             )
+            for i in range(2, 51)
+        )
+        WikiPage.objects.filter(id=page.id).update(content="# Version 50")
 
         # Verify all revisions exist
         assert PageRevision.objects.filter(page=page).count() == 50
 
-        # Verify we can still view the page
-        response = client.get("/user/performanceuser/performance-test/")
+        # Verify we can still view the page, without a query per revision
+        with django_assert_max_num_queries(5):
+            response = client.get("/user/performanceuser/performance-test/")
         assert response.status_code == 200
 
-        # Verify we can still view revisions
-        response = client.get(f"/page/{page.id}/revisions/")
+        # Verify we can still view revisions, without a query per revision
+        with django_assert_max_num_queries(6):
+            response = client.get(f"/page/{page.id}/revisions/")
         assert response.status_code == 200
 
         # Verify we can still edit the page
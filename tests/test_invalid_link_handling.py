@@ -2,18 +2,16 @@
 Test cases for invalid wiki link handling
 """
 
-from django.contrib.auth.models import User
 from wiki.models import WikiPage
 
 
 class TestInvalidLinkHandling:
     """Test handling of invalid wiki links"""
 
-    def test_invalid_same_user_link_redirects_to_create(self, client, db):
+    def test_invalid_same_user_link_redirects_to_create(self, client, login_as):
         """Test that invalid same-user links redirect to create page"""
         # Create and login a user
-        user = User.objects.create_user(username="testuser", password="testpass")
-        client.login(username="testuser", password="testpass")
+        user = login_as("testuser")
 
         # Create a page with an invalid link
         page = WikiPage.objects.create(
@@ -28,7 +26,7 @@ class TestInvalidLinkHandling:
         assert response.status_code == 200
 
         # The link should be marked as invalid
-        assert 'class="wiki-link-invalid"' in response.content.decode()
+        assert b'class="wiki-link-invalid"' in response.content
 
         # Now try to access the invalid link directly
         response = client.get(f"/user/{user.username}/invalid_link/create/")
@@ -37,12 +35,11 @@ class TestInvalidLinkHandling:
         assert response.status_code in [301, 302, 303]
         assert "/create/" in response.url
 
-    def test_invalid_cross_user_link_returns_404(self, client, db):
+    def test_invalid_cross_user_link_returns_404(self, client, login_as, make_user):
         """Test that invalid cross-user links return 404"""
         # Create and login a user
-        user1 = User.objects.create_user(username="user1", password="testpass")
-        User.objects.create_user(username="user2", password="testpass")
-        client.login(username="user1", password="testpass")
+        user1 = login_as("user1")
+        make_user("user2")
 
         # Create a page with an invalid cross-user link
         page = WikiPage.objects.create(
@@ -57,9 +54,8 @@ class TestInvalidLinkHandling:
         assert response.status_code == 200
 
         # The link should be marked as invalid
-        content = response.content.decode()
-        assert 'class="wiki-link-invalid"' in content
-        assert 'data-wiki-username="user2"' in content
+        assert b'class="wiki-link-invalid"' in response.content
+        assert b'data-wiki-username="user2"' in response.content
 
         # Try to access the invalid cross-user link directly
         response = client.get("/user/user2/nonexistent/")
@@ -67,12 +63,11 @@ class TestInvalidLinkHandling:
         # Should return 404
         assert response.status_code == 404
 
-    def test_valid_cross_user_link_works(self, client, db):
+    def test_valid_cross_user_link_works(self, client, login_as, make_user):
         """Test that valid cross-user links work correctly"""
         # Create two users
-        user1 = User.objects.create_user(username="user1", password="testpass")
-        user2 = User.objects.create_user(username="user2", password="testpass")
-        client.login(username="user1", password="testpass")
+        user1 = login_as("user1")
+        user2 = make_user("user2")
 
         # Create a page for user2
         WikiPage.objects.create(
@@ -95,18 +90,17 @@ class TestInvalidLinkHandling:
         assert response.status_code == 200
 
         # The link should be marked as valid
-        assert 'class="wiki-link-valid"' in response.content.decode()
+        assert b'class="wiki-link-valid"' in response.content
 
         # Access the cross-user link
         response = client.get("/user/user2/target_page/")
         assert response.status_code == 200
         assert b"Target Content" in response.content
 
-    def test_invalid_same_user_link_with_display_text(self, client, db):
+    def test_invalid_same_user_link_with_display_text(self, client, login_as):
         """Test that invalid same-user links with display text work correctly"""
         # Create and login a user
-        user = User.objects.create_user(username="testuser", password="testpass")
-        client.login(username="testuser", password="testpass")
+        user = login_as("testuser")
 
         # Create a page with an invalid link with display text
         page = WikiPage.objects.create(
@@ -121,9 +115,8 @@ class TestInvalidLinkHandling:
         assert response.status_code == 200
 
         # The link should be marked as invalid and show display text
-        content = response.content.decode()
-        assert 'class="wiki-link-invalid"' in content
-        assert "Custom Display" in content
+        assert b'class="wiki-link-invalid"' in response.content
+        assert b"Custom Display" in response.content
 
         # Clicking the link should redirect to create page
         response = client.get(f"/user/{user.username}/invalid_link/create/")
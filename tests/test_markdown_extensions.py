@@ -2,32 +2,33 @@
 Test cases for markdown extensions
 """
 
-from django.contrib.auth.models import User
+import pytest
 from wiki.models import WikiPage
-from wiki.markdown_extensions import render_markdown_with_wiki_links, wiki_link_plugin
-from markdown_it import MarkdownIt
+from wiki.markdown_extensions import render_markdown_with_wiki_links
 
 
 class TestWikiLinkPlugin:
     """Test the wiki link markdown plugin"""
 
-    def test_wiki_link_basic(self):
+    @pytest.mark.parametrize(
+        "target,slug",
+        [
+            pytest.param("test_page", "test_page", id="basic"),
+            # Spaces are converted to underscores
+            pytest.param("Test Page", "Test_Page", id="spaces"),
+        ],
+    )
+    def test_wiki_link_basic(self, md, target, slug):
         """Test basic [[wiki link]] syntax"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
-        result = md.render("This is a [[Test Page]] link.")
+        result = md.render(f"This is a [[{target}]] link.")
 
         assert (
-            '<a href="/Test_Page.html" data-wiki-link="Test_Page" class="wiki-link-invalid">Test Page</a>'
+            f'<a href="/{slug}.html" data-wiki-link="{slug}" class="wiki-link-invalid">{target}</a>'
             in result
         )
 
-    def test_wiki_link_with_display_text(self):
+    def test_wiki_link_with_display_text(self, md):
         """Test [[target|display]] syntax"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("This is a [[test_page|Display Text]] link.")
 
         assert (
@@ -35,23 +36,8 @@ class TestWikiLinkPlugin:
             in result
         )
 
-    def test_wiki_link_with_spaces(self):
-        """Test that spaces are converted to underscores"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
-        result = md.render("This is a [[Test Page]] link.")
-
-        assert (
-            '<a href="/Test_Page.html" data-wiki-link="Test_Page" class="wiki-link-invalid">Test Page</a>'
-            in result
-        )
-
-    def test_wiki_link_mixed_with_regular_markdown(self):
+    def test_wiki_link_mixed_with_regular_markdown(self, md):
         """Test wiki links mixed with regular markdown"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render(
             "# Heading\n\nSome text with [[wiki link]] and [regular link](http://example.com)."
         )
@@ -63,11 +49,8 @@ class TestWikiLinkPlugin:
         assert "<a href=" in result
         assert "http://example.com" in result
 
-    def test_wiki_link_nested_in_other_elements(self):
+    def test_wiki_link_nested_in_other_elements(self, md):
         """Test wiki links inside other markdown elements"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("**Bold [[wiki link]]** and *italic [[another link]]*.")
 
         assert (
@@ -80,11 +63,8 @@ class TestWikiLinkPlugin:
             in result
         )
 
-    def test_wiki_link_in_list(self):
+    def test_wiki_link_in_list(self, md):
         """Test wiki links in list items"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("- Item with [[wiki link]]\n- Another item")
 
         assert (
@@ -92,21 +72,15 @@ class TestWikiLinkPlugin:
             in result
         )
 
-    def test_wiki_link_in_code_block(self):
+    def test_wiki_link_in_code_block(self, md):
         """Test that wiki links don't work inside code blocks"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("```\n[[This should not be a link]]\n```")
 
         # Code blocks should preserve the original text
         assert "[[This should not be a link]]" in result
 
-    def test_wiki_link_with_pipe_in_display_text(self):
+    def test_wiki_link_with_pipe_in_display_text(self, md):
         """Test wiki link with pipe in display text"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("[[target|display|with|pipes]]")
 
         # Should only split on first pipe
@@ -115,11 +89,8 @@ class TestWikiLinkPlugin:
             in result
         )
 
-    def test_wiki_link_unclosed(self):
+    def test_wiki_link_unclosed(self, md):
         """Test that unclosed wiki links are not processed"""
-        md = MarkdownIt()
-        md.use(wiki_link_plugin)
-
         result = md.render("This has [[an unclosed link")
 
         # Should not create a link
@@ -139,10 +110,10 @@ class TestRenderMarkdownWithWikiLinks:
             in result
         )
 
-    def test_render_with_username_no_pages(self, db):
+    def test_render_with_username_no_pages(self, make_user):
         """Test rendering with username but no pages exist"""
         # Create a user but no pages
-        User.objects.create_user(username="testuser_no_pages", password="testpass")
+        make_user("testuser_no_pages")
 
         result = render_markdown_with_wiki_links(
             "This is [[a test]] link.", "testuser_no_pages"
@@ -154,9 +125,9 @@ class TestRenderMarkdownWithWikiLinks:
             in result
         )
 
-    def test_render_with_valid_link(self, db):
+    def test_render_with_valid_link(self, make_user):
         """Test rendering with a valid wiki link"""
-        user = User.objects.create_user(username="testuser_valid", password="testpass")
+        user = make_user("testuser_valid")
         WikiPage.objects.create(
             title="Test Page Valid",
             slug="test_page_valid",
@@ -174,11 +145,9 @@ class TestRenderMarkdownWithWikiLinks:
             in result
         )
 
-    def test_render_with_invalid_link(self, db):
+    def test_render_with_invalid_link(self, make_user):
         """Test rendering with an invalid wiki link"""
-        user = User.objects.create_user(
-            username="testuser_invalid", password="testpass"
-        )
+        user = make_user("testuser_invalid")
         WikiPage.objects.create(
             title="Test Page Invalid",
             slug="test_page_invalid",
@@ -196,11 +165,9 @@ class TestRenderMarkdownWithWikiLinks:
             in result
         )
 
-    def test_render_with_display_text(self, db):
+    def test_render_with_display_text(self, make_user):
         """Test rendering with display text"""
-        user = User.objects.create_user(
-            username="testuser_display", password="testpass"
-        )
+        user = make_user("testuser_display")
         WikiPage.objects.create(
             title="Test Page Display",
             slug="test_page_display",
@@ -218,9 +185,9 @@ class TestRenderMarkdownWithWikiLinks:
             in result
         )
 
-    def test_render_mixed_valid_and_invalid(self, db):
+    def test_render_mixed_valid_and_invalid(self, make_user):
         """Test rendering with both valid and invalid links"""
-        user = User.objects.create_user(username="testuser_mixed", password="testpass")
+        user = make_user("testuser_mixed")
         WikiPage.objects.create(
             title="Test Page 1 Mixed",
             slug="test_page_1_mixed",
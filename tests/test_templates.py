@@ -2,20 +2,18 @@
 Test cases for template instantiation
 """
 
-from django.contrib.auth.models import User
 from wiki.models import WikiPage
-from wiki.markdown_extensions import render_markdown_with_wiki_links
+from wiki.markdown_extensions import (
+    _resolve_template_content,
+    render_markdown_with_wiki_links,
+)
 
 
 class TestTemplateInstantiation:
     """Test template instantiation with and without parameters"""
 
-    def test_simple_template(self, db):
+    def test_simple_template(self, user):
         """Test basic {{template}} syntax"""
-        user = User.objects.create_user(
-            username="testuser_template", password="testpass"
-        )
-
         # Create a template page
         WikiPage.objects.create(
             title="Userbox",
@@ -40,10 +38,8 @@ class TestTemplateInstantiation:
         assert "Hello!" in result
         assert "{{userbox}}" not in result
 
-    def test_template_with_parameters(self, db):
+    def test_template_with_parameters(self, user):
         """Test {{template|param=value}} syntax"""
-        user = User.objects.create_user(username="testuser_params", password="testpass")
-
         # Create a template with parameters
         WikiPage.objects.create(
             title="Userbox",
@@ -69,10 +65,8 @@ class TestTemplateInstantiation:
         assert "{{{name}}}" not in result
         assert "{{userbox|name=Bob}}" not in result
 
-    def test_template_with_multiple_parameters(self, db):
+    def test_template_with_multiple_parameters(self, user):
         """Test template with multiple parameters"""
-        user = User.objects.create_user(username="testuser_multi", password="testpass")
-
         # Create a template with multiple parameters
         WikiPage.objects.create(
             title="Userbox",
@@ -98,12 +92,8 @@ class TestTemplateInstantiation:
         assert "{{{name}}}" not in result
         assert "{{{age}}}" not in result
 
-    def test_nonexistent_template(self, db):
+    def test_nonexistent_template(self, user, django_assert_num_queries):
         """Test that nonexistent templates are left as-is"""
-        user = User.objects.create_user(
-            username="testuser_nonexist", password="testpass"
-        )
-
         # Create a page that uses a nonexistent template
         page = WikiPage.objects.create(
             title="Test Page",
@@ -112,112 +102,116 @@ class TestTemplateInstantiation:
             author=user,
         )
 
-        # Render the page
-        result = render_markdown_with_wiki_links(page.content, user.username)
+        # Render the page: the user check and one template lookup
+        with django_assert_num_queries(2):
+            result = render_markdown_with_wiki_links(page.content, user.username)
 
         # Should keep the original text
         assert "Welcome! {{nonexistent_template}}" in result
 
-    def test_nested_templates(self, db):
+    def test_nested_templates(self, user, django_assert_num_queries):
         """Test nested template instantiation"""
-        user = User.objects.create_user(username="testuser_nested", password="testpass")
-
-        # Create a base template
-        WikiPage.objects.create(
-            title="Base",
-            slug="base",
-            content="Base content with {{{name}}}",
-            author=user,
-        )
-
-        # Create a template that uses the base template
-        WikiPage.objects.create(
-            title="Nested",
-            slug="nested",
-            content="Nested: {{base|name=Test}}",
-            author=user,
-        )
-
-        # Create a page that uses the nested template
-        page = WikiPage.objects.create(
-            title="Test Page",
-            slug="test_page",
-            content="Page: {{nested}}",
-            author=user,
+        _, _, page = WikiPage.objects.bulk_create(
+            [
+                # Create a base template
+                WikiPage(
+                    title="Base",
+                    slug="base",
+                    content="Base content with {{{name}}}",
+                    author=user,
+                ),
+                # Create a template that uses the base template
+                WikiPage(
+                    title="Nested",
+                    slug="nested",
+                    content="Nested: {{base|name=Test}}",
+                    author=user,
+                ),
+                # Create a page that uses the nested template
+                WikiPage(
+                    title="Test Page",
+                    slug="test_page",
+                    content="Page: {{nested}}",
+                    author=user,
+                ),
+            ]
         )
 
-        # Render the page
-        result = render_markdown_with_wiki_links(page.content, user.username)
+        # Render the page: the user check, then one lookup per nesting level
+        with django_assert_num_queries(4):
+            result = render_markdown_with_wiki_links(page.content, user.username)
 
         # Should resolve both templates
         assert "Page: Nested: Base content with Test" in result
         assert "{{nested}}" not in result
         assert "{{base|name=Test}}" not in result
 
-    def test_template_cycle_detection(self, db):
+    def test_template_cycle_detection(self, user, django_assert_num_queries):
         """Test that circular template references are handled"""
-        user = User.objects.create_user(username="testuser_cycle", password="testpass")
-
-        # Create templates that reference each other
-        WikiPage.objects.create(
-            title="Template A",
-            slug="template_a",
-            content="A: {{template_b}}",
-            author=user,
-        )
-
-        WikiPage.objects.create(
-            title="Template B",
-            slug="template_b",
-            content="B: {{template_a}}",
-            author=user,
+        _, _, page = WikiPage.objects.bulk_create(
+            [
+                # Create templates that reference each other
+                WikiPage(
+                    title="Template A",
+                    slug="template_a",
+                    content="A: {{template_b}}",
+                    author=user,
+                ),
+                WikiPage(
+                    title="Template B",
+                    slug="template_b",
+                    content="B: {{template_a}}",
+                    author=user,
+                ),
+                # Create a page that uses template A
+                WikiPage(
+                    title="Test Page",
+                    slug="test_page",
+                    content="Page: {{template_a}}",
+                    author=user,
+                ),
+            ]
         )
 
-        # Create a page that uses template A
-        page = WikiPage.objects.create(
-            title="Test Page",
-            slug="test_page",
-            content="Page: {{template_a}}",
-            author=user,
-        )
-
-        # Render the page
-        result = render_markdown_with_wiki_links(page.content, user.username)
+        # Render the page: the user check, then one lookup per template in the cycle
+        with django_assert_num_queries(3):
+            result = render_markdown_with_wiki_links(page.content, user.username)
 
         # Should detect the cycle and not infinite loop
         # The cycle should be broken and the unresolved template should be shown
         assert "Page: A: B: {{template_a}}" in result
 
-    def test_template_with_wiki_links(self, db):
+    def test_template_with_wiki_links(self, user, django_assert_num_queries):
         """Test that templates can contain wiki links"""
-        user = User.objects.create_user(username="testuser_wiki", password="testpass")
-
-        # Create a template with a wiki link
-        WikiPage.objects.create(
-            title="Userbox",
-            slug="userbox",
-            content="Check out my [[other_page]]!",
-            author=user,
-        )
-
-        # Create the target page for the wiki link
-        WikiPage.objects.create(
-            title="Other Page",
-            slug="other_page",
-            content="Other content",
-            author=user,
+        _, _, page = WikiPage.objects.bulk_create(
+            [
+                # Create a template with a wiki link
+                WikiPage(
+                    title="Userbox",
+                    slug="userbox",
+                    content="Check out my [[other_page]]!",
+                    author=user,
+                ),
+                # Create the target page for the wiki link
+                WikiPage(
+                    title="Other Page",
+                    slug="other_page",
+                    content="Other content",
+                    author=user,
+                ),
+                # Create a page that uses the template
+                WikiPage(
+                    title="Test Page",
+                    slug="test_page",
+                    content="Welcome! {{userbox}}",
+                    author=user,
+                ),
+            ]
         )
 
-        # Create a page that uses the template
-        page = WikiPage.objects.create(
-            title="Test Page",
-            slug="test_page",
-            content="Welcome! {{userbox}}",
-            author=user,
-        )
-
-        # Render the page
-        result = render_markdown_with_wiki_links(page.content, user.username)
+        # Render the page: the user check, the template lookup and the link validation
+        with django_assert_num_queries(3):
+            result = render_markdown_with_wiki_links(page.content, user.username)
 
         # Should render both the template and the wiki link
         assert "Welcome!" in result
@@ -225,10 +219,10 @@ class TestTemplateInstantiation:
         assert '<a href="/other_page.html"' in result
         assert "wiki-link-valid" in result
 
-    def test_template_without_username(self, db):
+    def test_template_without_username(self, make_user):
         """Test template resolution without username (cross-user templates)"""
-        user1 = User.objects.create_user(username="user1", password="testpass")
-        user2 = User.objects.create_user(username="user2", password="testpass")
+        user1 = make_user("user1")
+        user2 = make_user("user2")
 
         # Create a template in user1's namespace
         WikiPage.objects.create(
@@ -253,10 +247,8 @@ class TestTemplateInstantiation:
         assert "Welcome!" in result
         assert "Hello from user1!" in result
 
-    def test_template_with_markdown(self, db):
+    def test_template_with_markdown(self, user):
         """Test that template content is rendered as markdown"""
-        user = User.objects.create_user(username="testuser_md", password="testpass")
-
         # Create a template with inline markdown
         WikiPage.objects.create(
             title="Userbox",
@@ -281,12 +273,8 @@ class TestTemplateInstantiation:
         assert "<strong>bold</strong>" in result
         assert "<em>italic</em>" in result
 
-    def test_template_with_multiple_invocations(self, db):
+    def test_template_with_multiple_invocations(self, user):
         """Test multiple invocations of the same template"""
-        user = User.objects.create_user(
-            username="testuser_multi_inv", password="testpass"
-        )
-
         # Create a template
         WikiPage.objects.create(
             title="Userbox",
@@ -310,12 +298,37 @@ class TestTemplateInstantiation:
         assert "First: Hello Alice!" in result
         assert "Second: Hello Bob!" in result
 
-    def test_template_with_no_parameters_but_param_syntax(self, db):
-        """Test template with parameter placeholders but no parameters provided"""
-        user = User.objects.create_user(
-            username="testuser_no_params", password="testpass"
+    def test_template_lookups_are_batched(self, user, django_assert_num_queries):
+        """Test that repeated and distinct templates don't add a query each"""
+        WikiPage.objects.create(
+            title="Greeting", slug="greeting", content="Hello {{{name}}}!", author=user
+        )
+        WikiPage.objects.create(
+            title="Footer", slug="footer", content="Bye {{greeting}}", author=user
+        )
+
+        # One query checks the user, then one per level of template nesting
+        with django_assert_num_queries(3):
+            result = render_markdown_with_wiki_links(
+                "{{greeting|name=Alice}} {{greeting|name=Bob}} {{footer}} {{missing}}",
+                user.username,
+            )
+
+        assert "Hello Alice! Hello Bob! Bye Hello {{{name}}}!" in result
+        assert "{{missing}}" in result
+
+    def test_resolve_template_for_nonexistent_user(self, user):
+        """Test that templates don't resolve for a user that doesn't exist"""
+        WikiPage.objects.create(
+            title="Greeting", slug="greeting", content="Hello!", author=user
         )
 
+        assert _resolve_template_content("greeting", {}, "nobody") is None
+        assert _resolve_template_content("userbox", {"name": "A"}, "nobody") is None
+        assert _resolve_template_content("greeting", {}, user.username) == "Hello!"
+
+    def test_template_with_no_parameters_but_param_syntax(self, user):
+        """Test template with parameter placeholders but no parameters provided"""
         # Create a template with parameter placeholders
         WikiPage.objects.create(
             title="Userbox",
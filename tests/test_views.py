@@ -3,8 +3,10 @@ Test cases for wiki views
 """
 
 import pytest
+from django.contrib.auth.models import AnonymousUser
 
 from wiki.models import PageRevision, UserActivity, WikiPage
+from wiki.views import home, signup, user_login, view_wiki_page
 
 
 class TestAuthenticationViews:
@@ -66,19 +68,32 @@ class TestWikiPageViews:
     """Test wiki page views"""
 
     @pytest.mark.django_db
-    def test_home_page_works(self, client):
+    def test_home_page_works(self, get_from_view):
         """Test that home page loads"""
-        response = client.get("/")
+        response = get_from_view(home, AnonymousUser())
         assert response.status_code == 200
 
-    def test_signup_page_works(self, client):
+    def test_home_page_query_count_is_constant(
+        self, client, make_user, django_assert_max_num_queries
+    ):
+        """Test that listing pages doesn't query each page's author"""
+        for username in ("alice", "bob", "carol"):
+            WikiPage.objects.create(
+                title=f"{username} page", content="# Test", author=make_user(username)
+            )
+
+        with django_assert_max_num_queries(1):
+            response = client.get("/")
+        assert response.status_code == 200
+
+    def test_signup_page_works(self, get_from_view):
         """Test that signup page loads"""
-        response = client.get("/signup/")
+        response = get_from_view(signup, AnonymousUser())
         assert response.status_code == 200
 
-    def test_login_page_works(self, client):
+    def test_login_page_works(self, get_from_view):
         """Test that login page loads"""
-        response = client.get("/login/")
+        response = get_from_view(user_login, AnonymousUser())
         assert response.status_code == 200
 
     def test_create_page_requires_login(self, client):
@@ -96,9 +111,9 @@ class TestWikiPageViews:
         response = logged_in_client.get(f"/user/{user.username}/")
         assert response.status_code == 200
 
-    def test_view_wiki_page_works(self, logged_in_client, wiki_page, user):
+    def test_view_wiki_page_works(self, get_from_view, wiki_page, user):
         """Test that viewing a wiki page works"""
-        response = logged_in_client.get(f"/user/{user.username}/{wiki_page.slug}/")
+        response = get_from_view(view_wiki_page, user, user.username, wiki_page.slug)
         assert response.status_code == 200
         assert wiki_page.title.encode() in response.content
 
@@ -147,17 +162,14 @@ class TestPageEditing:
 
     def test_edit_page_creates_new_revision(self, logged_in_client, wiki_page, user):
         """Test that editing a page creates new revision"""
-        initial_revisions = PageRevision.objects.filter(page=wiki_page).count()
-
         response = logged_in_client.post(
             f"/edit/{wiki_page.id}/",
             {"title": "Updated Page", "content": "# Updated Content"},
         )
 
         assert response.status_code == 302
-        assert (
-            PageRevision.objects.filter(page=wiki_page).count() == initial_revisions + 1
-        )
+        # The wiki_page fixture starts without revisions
+        assert wiki_page.revisions.count() == 1
 
         # Check that new revision is current
         current_revision = PageRevision.objects.filter(
@@ -168,20 +180,13 @@ class TestPageEditing:
 
     def test_edit_page_logs_activity(self, logged_in_client, wiki_page):
         """Test that editing a page logs activity"""
-        initial_activities = UserActivity.objects.filter(
-            activity_type="edit_page"
-        ).count()
-
         response = logged_in_client.post(
             f"/edit/{wiki_page.id}/",
             {"title": "Updated Page", "content": "# Updated Content"},
         )
 
         assert response.status_code == 302
-        assert (
-            UserActivity.objects.filter(activity_type="edit_page").count()
-            == initial_activities + 1
-        )
+        assert UserActivity.objects.filter(activity_type="edit_page").count() == 1
 
     def test_edit_page_redirects_to_profile(self, logged_in_client, wiki_page, user):
         """Test that edit page redirects to user profile"""
@@ -216,17 +221,10 @@ class TestPageDeletion:
 
     def test_delete_page_logs_activity(self, logged_in_client, wiki_page):
         """Test that deleting a page logs activity"""
-        initial_activities = UserActivity.objects.filter(
-            activity_type="delete_page"
-        ).count()
-
         response = logged_in_client.post(f"/delete/{wiki_page.id}/")
 
         assert response.status_code == 302
-        assert (
-            UserActivity.objects.filter(activity_type="delete_page").count()
-            == initial_activities + 1
-        )
+        assert UserActivity.objects.filter(activity_type="delete_page").count() == 1
 
     def test_delete_page_redirects_to_profile(self, logged_in_client, wiki_page, user):
         """Test that delete page redirects to user profile"""
@@ -256,19 +254,23 @@ class TestRevisionViews:
     ):
         """Test that view revisions shows all revisions"""
         # Create multiple revisions
-        PageRevision.objects.create(
-            page=wiki_page,
-            title="Version 1",
-            content="# Version 1",
-            editor=user,
-            is_current=False,
-        )
-        PageRevision.objects.create(
-            page=wiki_page,
-            title="Version 2",
-            content="# Version 2",
-            editor=user,
-            is_current=True,
+        PageRevision.objects.bulk_create(
+            [
+                PageRevision(
+                    page=wiki_page,
+                    title="Version 1",
+                    content="# Version 1",
+                    editor=user,
+                    is_current=False,
+                ),
+                PageRevision(
+                    page=wiki_page,
+                    title="Version 2",
+                    content="# Version 2",
+                    editor=user,
+                    is_current=True,
+                ),
+            ]
         )
 
         response = logged_in_client.get(f"/page/{wiki_page.id}/revisions/")
@@ -323,19 +325,12 @@ class TestRevisionRestoration:
         self, logged_in_client, wiki_page, page_revision
     ):
         """Test that restoring a revision logs activity"""
-        initial_activities = UserActivity.objects.filter(
-            activity_type="edit_page"
-        ).count()
-
         response = logged_in_client.post(
             f"/page/{wiki_page.id}/revisions/{page_revision.id}/restore/"
         )
 
         assert response.status_code == 302
-        assert (
-            UserActivity.objects.filter(activity_type="edit_page").count()
-            == initial_activities + 1
-        )
+        assert UserActivity.objects.filter(activity_type="edit_page").count() == 1
 
     def test_restore_revision_redirects_to_page(
         self, logged_in_client, wiki_page, page_revision, user
@@ -378,6 +373,23 @@ class TestActivityViews:
         assert b"User logged in" in response.content
         assert b"User created page" in response.content
 
+    def test_user_activity_query_count_is_constant(
+        self, logged_in_client, user, make_user, django_assert_max_num_queries
+    ):
+        """Test that the feed doesn't query each activity's page and author"""
+        for username in ("alice", "bob", "carol"):
+            page = WikiPage.objects.create(
+                title=f"{username} page", content="# Test", author=make_user(username)
+            )
+            UserActivity.objects.create(
+                user=user, activity_type="edit_page", page=page, details="Edited"
+            )
+
+        with django_assert_max_num_queries(5):
+            response = logged_in_client.get(f"/user/{user.username}/activity/")
+        assert response.status_code == 200
+        assert b"carol page" in response.content
+
 
 class TestPermissionChecks:
     """Test permission checks in views"""
@@ -407,39 +419,22 @@ class TestPermissionChecks:
         assert response.status_code == 302  # Redirect to their own profile
 
     def test_user_cannot_view_other_users_revisions(
-        self, logged_in_client, second_user, wiki_page, page_revision
+        self, logged_in_client, second_user, wiki_page, page_revision, make_page
     ):
         """Test that users cannot view other users' revisions"""
         # Create a page owned by second_user
-        second_page = WikiPage.objects.create(
-            title="Second User Page", content="# Content", author=second_user
-        )
-        PageRevision.objects.create(
-            page=second_page,
-            title="Second User Page",
-            content="# Content",
-            editor=second_user,
-            is_current=True,
-        )
+        second_page = make_page(second_user, "Second User Page", "# Content")
 
         response = logged_in_client.get(f"/page/{second_page.id}/revisions/")
         assert response.status_code == 302  # Redirect to their own profile
 
     def test_user_cannot_restore_other_users_revisions(
-        self, logged_in_client, second_user, wiki_page, page_revision
+        self, logged_in_client, second_user, wiki_page, page_revision, make_page
     ):
         """Test that users cannot restore other users' revisions"""
         # Create a page owned by second_user
-        second_page = WikiPage.objects.create(
-            title="Second User Page", content="# Content", author=second_user
-        )
-        second_revision = PageRevision.objects.create(
-            page=second_page,
-            title="Second User Page",
-            content="# Content",
-            editor=second_user,
-            is_current=True,
-        )
+        second_page = make_page(second_user, "Second User Page", "# Content")
+        second_revision = second_page.revisions.get()
 
         response = logged_in_client.post(
             f"/page/{second_page.id}/revisions/{second_revision.id}/restore/"
@@ -38,8 +38,8 @@ class TestWikiLinkIntegration:
         assert response.status_code == 200
 
         # Check that the wiki link is rendered with the valid class
-        assert 'class="wiki-link-valid"' in response.content.decode()
-        assert 'href="/target_page.html"' in response.content.decode()
+        assert b'class="wiki-link-valid"' in response.content
+        assert b'href="/target_page.html"' in response.content
 
     def test_wiki_link_in_view_with_invalid_link(self, client, db):
         """Test that wiki links work in the actual view with invalid links"""
@@ -61,8 +61,8 @@ class TestWikiLinkIntegration:
         assert response.status_code == 200
 
         # Check that the wiki link is rendered with the invalid class
-        assert 'class="wiki-link-invalid"' in response.content.decode()
-        assert 'href="/nonexistent_page.html"' in response.content.decode()
+        assert b'class="wiki-link-invalid"' in response.content
+        assert b'href="/nonexistent_page.html"' in response.content
 
     def test_wiki_link_with_display_text(self, client, db):
         """Test that wiki links with display text work correctly"""
@@ -92,11 +92,11 @@ class TestWikiLinkIntegration:
         assert response.status_code == 200
 
         # Check that the wiki link is rendered with display text and valid class
-        assert 'class="wiki-link-valid"' in response.content.decode()
-        assert 'href="/target_page.html"' in response.content.decode()
-        assert "Custom Display Text" in response.content.decode()
+        assert b'class="wiki-link-valid"' in response.content
+        assert b'href="/target_page.html"' in response.content
+        assert b"Custom Display Text" in response.content
 
-    def test_mixed_wiki_links(self, client, db):
+    def test_mixed_wiki_links(self, client, db, django_assert_num_queries):
         """Test that both valid and invalid wiki links can coexist"""
         # Create a user
         user = User.objects.create_user(username="testuser4", password="testpass")
@@ -117,15 +117,16 @@ class TestWikiLinkIntegration:
             author=user,
         )
 
-        # View the source page
-        response = client.get(f"/user/{user.username}/{source_page.slug}/")
+        # View the source page: the user, the page, and one query to validate
+        # all of its links
+        with django_assert_num_queries(3):
+            response = client.get(f"/user/{user.username}/{source_page.slug}/")
 
         # Check that the response is successful
         assert response.status_code == 200
 
         # Check that both links are rendered correctly
-        content = response.content.decode()
-        assert 'class="wiki-link-valid"' in content
-        assert 'class="wiki-link-invalid"' in content
-        assert 'href="/target_page.html"' in content
-        assert 'href="/nonexistent.html"' in content
+        assert b'class="wiki-link-valid"' in response.content
+        assert b'class="wiki-link-invalid"' in response.content
+        assert b'href="/target_page.html"' in response.content
+        assert b'href="/nonexistent.html"' in response.content
@@ -1,4 +1,4 @@
-from typing import ClassVar, Tuple
+from typing import ClassVar
 
 from django.contrib import admin
 
@@ -7,50 +7,56 @@ from .models import Follow, PageRevision, UserActivity, WikiPage
 
 @admin.register(WikiPage)
 class WikiPageAdmin(admin.ModelAdmin):
-    list_display: Tuple[str, ...] = (
+    list_display: tuple[str, ...] = (
         "title",
         "author",
         "created_at",
         "updated_at",
     )
-    list_filter: ClassVar[Tuple[str, ...]] = ("author", "created_at")
-    search_fields: ClassVar[Tuple[str, ...]] = ("title", "content", "author__username")
+    list_filter: ClassVar[tuple[str, ...]] = ("author", "created_at")
+    list_select_related: ClassVar[tuple[str, ...]] = ("author",)
+    autocomplete_fields: ClassVar[tuple[str, ...]] = ("author",)
+    # Searching "content" would LIKE-scan every markdown body
+    search_fields: ClassVar[tuple[str, ...]] = ("title", "author__username")
     date_hierarchy: ClassVar[str] = "created_at"
 
 
 @admin.register(PageRevision)
 class PageRevisionAdmin(admin.ModelAdmin):
-    list_display: Tuple[str, ...] = ("page", "editor", "created_at", "is_current")
-    list_filter: ClassVar[Tuple[str, ...]] = ("editor", "created_at", "is_current")
-    search_fields: ClassVar[Tuple[str, ...]] = (
-        "page__title",
-        "editor__username",
-        "content",
-    )
+    list_display: tuple[str, ...] = ("page", "editor", "created_at", "is_current")
+    list_filter: ClassVar[tuple[str, ...]] = ("editor", "created_at", "is_current")
+    # str(page) includes the page author's username
+    list_select_related: ClassVar[tuple[str, ...]] = ("page__author", "editor")
+    autocomplete_fields: ClassVar[tuple[str, ...]] = ("page", "editor")
+    search_fields: ClassVar[tuple[str, ...]] = ("page__title", "editor__username")
     date_hierarchy: ClassVar[str] = "created_at"
-    readonly_fields: ClassVar[Tuple[str, ...]] = ("created_at",)
+    readonly_fields: ClassVar[tuple[str, ...]] = ("created_at",)
 
 
 @admin.register(UserActivity)
 class UserActivityAdmin(admin.ModelAdmin):
-    list_display: Tuple[str, ...] = ("user", "activity_type", "created_at", "page")
-    list_filter: ClassVar[Tuple[str, ...]] = ("activity_type", "created_at")
-    search_fields: ClassVar[Tuple[str, ...]] = (
+    list_display: tuple[str, ...] = ("user", "activity_type", "created_at", "page")
+    list_filter: ClassVar[tuple[str, ...]] = ("activity_type", "created_at")
+    list_select_related: ClassVar[tuple[str, ...]] = ("user", "page__author")
+    autocomplete_fields: ClassVar[tuple[str, ...]] = ("user", "page")
+    search_fields: ClassVar[tuple[str, ...]] = (
         "user__username",
         "page__title",
         "details",
     )
     date_hierarchy: ClassVar[str] = "created_at"
-    readonly_fields: ClassVar[Tuple[str, ...]] = ("created_at",)
+    readonly_fields: ClassVar[tuple[str, ...]] = ("created_at",)
 
 
 @admin.register(Follow)
 class FollowAdmin(admin.ModelAdmin):
-    list_display: Tuple[str, ...] = ("follower", "following", "created_at")
-    list_filter: ClassVar[Tuple[str, ...]] = ("created_at",)
-    search_fields: ClassVar[Tuple[str, ...]] = (
+    list_display: tuple[str, ...] = ("follower", "following", "created_at")
+    list_filter: ClassVar[tuple[str, ...]] = ("created_at",)
+    list_select_related: ClassVar[tuple[str, ...]] = ("follower", "following")
+    autocomplete_fields: ClassVar[tuple[str, ...]] = ("follower", "following")
+    search_fields: ClassVar[tuple[str, ...]] = (
         "follower__username",
         "following__username",
     )
     date_hierarchy: ClassVar[str] = "created_at"
-    readonly_fields: ClassVar[Tuple[str, ...]] = ("created_at",)
+    readonly_fields: ClassVar[tuple[str, ...]] = ("created_at",)
@@ -2,19 +2,33 @@
 Markdown extensions for the wiki application.
 """
 
+from __future__ import annotations
+
+import functools
+import html
 import re
-from typing import Dict, Optional
+from collections.abc import Iterable
 
 from django.contrib.auth import get_user_model
 from markdown_it import MarkdownIt
 from markdown_it.rules_inline import StateInline
+from markdown_it.token import Token
 
 from .models import WikiPage
 
 UserModel = get_user_model()
 
+# Template invocations like {{name}} or {{name|key=value}}
+_TEMPLATE_RE = re.compile(r"\{\{([^|\}]+)(?:\|([^}]*))?\}\}")
+# Template parameter references like {{{key}}}
+_TEMPLATE_PARAM_RE = re.compile(r"\{\{\{([^}]+)\}\}\}")
+# Standard markdown links like [text](url)
+_MARKDOWN_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^\)]+)\)")
+# URL schemes that can run script or read local data when used in a link
+_DANGEROUS_PROTOCOLS = ("javascript:", "data:", "vbscript:", "file:", "about:")
+
 
-def _parse_template_params(param_str: str) -> Dict[str, str]:
+def _parse_template_params(param_str: str) -> dict[str, str]:
     """
     Parse template parameters from the pipe-separated string.
 
@@ -24,41 +38,76 @@ def _parse_template_params(param_str: str) -> Dict[str, str]:
     Returns:
         Dict mapping parameter names to values, e.g., {"name": "Bob", "age": "25"}
     """
-    params: dict[str, str] = {}
-    if not param_str:
-        return params
+    # Split by pipe, then each part at its first "="; parts without one are
+    # ignored and later duplicates win
+    pairs = (part.partition("=") for part in param_str.split("|"))
+    return {key.strip(): value.strip() for key, sep, value in pairs if sep}
+
 
-    # Split by pipe, but only at top level (not within nested pipes)
-    parts = param_str.split("|")
-    for part in parts:
-        part = part.strip()
-        if "=" in part:
-            key, value = part.split("=", 1)
-            params[key.strip()] = value.strip()
+def _template_names(content: str) -> set[str]:
+    """
+    Collect the names of all templates invoked in the content.
 
-    return params
+    Args:
+        content: Text that may contain {{template}} invocations
+
+    Returns:
+        Set of template names, e.g., {"userbox", "infobox"}
+    """
+    return {match.group(1).strip() for match in _TEMPLATE_RE.finditer(content)}
+
+
+def _load_template_pages(
+    names: Iterable[str], pages: dict[str, WikiPage | None]
+) -> None:
+    """
+    Fetch the template pages for the given names in a single query.
+
+    Args:
+        names: Template names (page slugs) to look up
+        pages: Cache of template pages keyed by slug, updated in place.
+            Names without a matching page are stored as None.
+    """
+    missing = set(names).difference(pages)
+    if not missing:
+        return
+
+    found = WikiPage.objects.select_related("author").in_bulk(
+        missing, field_name="slug"
+    )
+    for name in missing:
+        pages[name] = found.get(name)
 
 
 def _resolve_template_content(
     template_name: str,
-    params: Dict[str, str],
-    username: Optional[str] = None,
-    visited: Optional[set] = None,
+    params: dict[str, str],
+    username: str | None = None,
+    visited: set | None = None,
     max_depth: int = 10,
-) -> Optional[str]:
+    pages: dict[str, WikiPage | None] | None = None,
+) -> str | None:
     """
     Resolve a template by its name and substitute parameters.
 
     Args:
         template_name: The slug of the template page to resolve
         params: Dictionary of parameters to substitute
-        username: Optional username to look up the template
+        username: Optional username of the user rendering the page
         visited: Set of already-visited template names to detect cycles
         max_depth: Maximum recursion depth to prevent stack overflow
+        pages: Cache of template pages keyed by slug, shared across the render
 
     Returns:
-        The resolved content with parameters substituted, or None if template not found
+        The resolved content with parameters substituted, or None if template
+        not found or the rendering user does not exist
     """
+    if pages is None:
+        # Callers sharing a page cache check the user once for the whole
+        # render; a standalone call has to do it here
+        if username and not UserModel.objects.filter(username=username).exists():
+            return None
+        pages = {}
     if visited is None:
         visited = set()
 
@@ -72,85 +121,72 @@ def _resolve_template_content(
 
     visited.add(template_name)
 
-    try:
-        # Special handling for userbox template
-        # Only use special handling if userbox is called with parameters
-        # or if no userbox template page exists
-        if template_name == "userbox" and params:
-            # Check if a userbox template page exists
-            try:
-                if username:
-                    user = UserModel.objects.get(username=username)
-                    WikiPage.objects.get(author=user, slug=template_name)
-                    # Userbox template page exists, use regular template resolution
-                else:
-                    WikiPage.objects.get(slug=template_name)
-                    # Userbox template page exists, use regular template resolution
-                # If we get here, a userbox template page exists, so use regular resolution
-                pass
-            except WikiPage.DoesNotExist:
-                # No userbox template page exists, use special handling
-                return _generate_userbox_html(params)
-
-        # Find the template page
-        if username:
-            # First try to find the template in the current user's namespace
-            user = UserModel.objects.get(username=username)
-            try:
-                template_page = WikiPage.objects.get(author=user, slug=template_name)
-            except WikiPage.DoesNotExist:
-                # If not found in current user's namespace, try to find it in any user's namespace
-                # This allows cross-user template usage
-                template_page = WikiPage.objects.get(slug=template_name)
-        else:
-            # If no username specified, look for any page with this slug
-            template_page = WikiPage.objects.get(slug=template_name)
-
-        content = template_page.content
-
-        # Recursively resolve any nested templates in the content
-        # We need to find all {{template}} patterns and resolve them
-
-        # Find all template invocations in the content
-        pattern = r"\{\{([^|\}]+)(?:\|([^}]*))?\}\}"
+    # Slugs are unique, so this is the template page whichever user owns it,
+    # which allows cross-user template usage
+    _load_template_pages([template_name], pages)
+    template_page = pages[template_name]
+
+    # Special handling for userbox template
+    # Only use special handling if userbox is called with parameters
+    # and the current user (or anyone, without a username) has no userbox page
+    if (
+        template_name == "userbox"
+        and params
+        and (
+            template_page is None
+            or (username and template_page.author.username != username)
+        )
+    ):
+        return _generate_userbox_html(params)
 
-        def replace_template(match: re.Match) -> str:
-            nested_template_name = match.group(1).strip()
-            nested_params_str = match.group(2) if match.group(2) else ""
-            nested_params = _parse_template_params(nested_params_str)
+    if template_page is None:
+        visited.remove(template_name)
+        return None
 
-            # Recursively resolve the nested template
-            resolved = _resolve_template_content(
-                nested_template_name, nested_params, username, visited, max_depth - 1
-            )
+    content = template_page.content
+
+    # Recursively resolve any nested templates in the content, fetching
+    # every template used at this level in one query
+    _load_template_pages(_template_names(content), pages)
+
+    def replace_template(match: re.Match) -> str:
+        nested_template_name = match.group(1).strip()
+        nested_params_str = match.group(2) if match.group(2) else ""
+        nested_params = _parse_template_params(nested_params_str)
+
+        # Recursively resolve the nested template
+        resolved = _resolve_template_content(
+            nested_template_name,
+            nested_params,
+            username,
+            visited,
+            max_depth - 1,
+            pages,
+        )
 
-            if resolved is not None:
-                return resolved
-            else:
-                # If template not found, return the original text
-                result = match.group(0)
-                assert isinstance(result, str)
-                return result
-
-        # Resolve nested templates first
-        content = re.sub(pattern, replace_template, content)
-
-        # Now substitute parameters in the resolved content
-        # Parameters are in the format {{{param_name}}}
-        def substitute_param(match: re.Match) -> str:
-            param_name = match.group(1).strip()
-            result = params.get(param_name, match.group(0))
+        if resolved is not None:
+            return resolved
+        else:
+            # If template not found, return the original text
+            result = match.group(0)
             assert isinstance(result, str)
             return result
 
-        content = re.sub(r"\{\{\{([^}]+)\}\}\}", substitute_param, content)
+    # Resolve nested templates first
+    content = _TEMPLATE_RE.sub(replace_template, content)
 
-        visited.remove(template_name)
-        return content
+    # Now substitute parameters in the resolved content
+    # Parameters are in the format {{{param_name}}}
+    def substitute_param(match: re.Match) -> str:
+        param_name = match.group(1).strip()
+        result = params.get(param_name, match.group(0))
+        assert isinstance(result, str)
+        return result
 
-    except (UserModel.DoesNotExist, WikiPage.DoesNotExist):
-        visited.remove(template_name)
-        return None
+    content = _TEMPLATE_PARAM_RE.sub(substitute_param, content)
+
+    visited.remove(template_name)
+    return content
 
 
 def _escape_html(text: str) -> str:
@@ -166,15 +202,9 @@ def _escape_html(text: str) -> str:
     if not text:
         return text
 
-    html_escape_table = {
-        "&": "&amp;",
-        "<": "&lt;",
-        ">": "&gt;",
-        '"': "&quot;",
-        "'": "&apos;",
-    }
-
-    return "".join(html_escape_table.get(c, c) for c in text)
+    # Same output as before, with apostrophes kept as &apos; rather than
+    # html.escape's &#x27;
+    return html.escape(text).replace("&#x27;", "&apos;")
 
 
 def _sanitize_url(url: str) -> str:
@@ -190,21 +220,10 @@ def _sanitize_url(url: str) -> str:
     if not url:
         return url
 
-    # List of dangerous protocols
-    dangerous_protocols = [
-        "javascript",
-        "data",
-        "vbscript",
-        "file",
-        "about",
-    ]
-
     # Check if URL starts with a dangerous protocol
-    url_lower = url.lower()
-    for protocol in dangerous_protocols:
-        if url_lower.startswith(protocol + ":"):
-            # Return a safe placeholder
-            return "#"
+    if url.lower().startswith(_DANGEROUS_PROTOCOLS):
+        # Return a safe placeholder
+        return "#"
 
     return url
 
@@ -219,23 +238,18 @@ def _sanitize_markdown_text(text: str) -> str:
     Returns:
         Sanitized markdown text with dangerous links replaced
     """
-    if not text:
+    # Without "](" there is no markdown link to sanitize
+    if not text or "](" not in text:
         return text
 
     # Replace dangerous protocols in markdown links
     # Pattern: [text](javascript:...), [text](data:...), etc.
-    import re
-
-    # Match markdown links with dangerous protocols
     def replace_dangerous_link(match: re.Match) -> str:
         link_text = match.group(1)  # The display text
         url = match.group(2)  # The URL
 
         # Check if URL uses a dangerous protocol
-        url_lower = url.lower()
-        dangerous_protocols = ["javascript:", "data:", "vbscript:", "file:", "about:"]
-
-        if any(url_lower.startswith(protocol) for protocol in dangerous_protocols):
+        if url.lower().startswith(_DANGEROUS_PROTOCOLS):
             # Replace with a safe link (hash)
             return f"[{link_text}](#)"
         result = match.group(0)
@@ -243,159 +257,27 @@ def _sanitize_markdown_text(text: str) -> str:
         return result
 
     # Apply the replacement
-    text = re.sub(r"\[([^\]]+)\]\(([^\)]+)\)", replace_dangerous_link, text)
+    text = _MARKDOWN_LINK_RE.sub(replace_dangerous_link, text)
 
     return text
 
 
-def _generate_userbox_html(params: Dict[str, str]) -> str:
-    """
-    Generate HTML for a userbox based on the provided parameters.
-
-    Args:
-        params: Dictionary of userbox parameters
-
-    Returns:
-        HTML string for the userbox
-    """
-    # Extract parameters with defaults
-    left = params.get("left", "")
-    middle = params.get("middle", "")
-    right = params.get("right", "")
-
-    left_bg = params.get("left-bg", "#f0f0f0")
-    left_fg = params.get("left-fg", "#000000")
-    middle_bg = params.get("middle-bg", "#f0f0f0")
-    middle_fg = params.get("middle-fg", "#000000")
-    right_bg = params.get("right-bg", "#f0f0f0")
-    right_fg = params.get("right-fg", "#000000")
-
-    # Sanitize URLs in markdown links to prevent XSS
-    # Replace dangerous protocols with safe placeholders
-    def sanitize_markdown_text(text: str) -> str:
-        """Sanitize markdown text by replacing dangerous URL protocols."""
-        if not text:
-            return text
-
-        # Replace dangerous protocols in markdown links
-        # Pattern: [text](javascript:...), [text](data:...), etc.
-        import re
-
-        # Match markdown links with dangerous protocols
-        def replace_dangerous_link(match: re.Match) -> str:
-            link_text = match.group(1)  # The display text
-            url = match.group(2)  # The URL
-
-            # Check if URL uses a dangerous protocol
-            url_lower = url.lower()
-            dangerous_protocols = [
-                "javascript:",
-                "data:",
-                "vbscript:",
-                "file:",
-                "about:",
-            ]
-
-            if any(url_lower.startswith(protocol) for protocol in dangerous_protocols):
-                # Replace with a safe link (hash)
-                return f"[{link_text}](#)"
-            result = match.group(0)
-            assert isinstance(result, str)
-            return result
-
-        # Apply the replacement
-        text = re.sub(r"\[([^\]]+)\]\(([^\)]+)\)", replace_dangerous_link, text)
-
-        return text
-
-    # Sanitize the markdown content (but don't escape yet - we'll do that after markdown rendering)
-    # This allows markdown features like apostrophes to work correctly
-    left_sanitized = _sanitize_markdown_text(left)
-    middle_sanitized = _sanitize_markdown_text(middle)
-    right_sanitized = _sanitize_markdown_text(right)
-
-    # Render markdown for the content sections
-    # We use a simple markdown renderer for the userbox content
-    md = MarkdownIt()
-
-    # Render markdown for each section
-    left_html = md.render(left_sanitized) if left_sanitized else left_sanitized
-    middle_html = md.render(middle_sanitized) if middle_sanitized else middle_sanitized
-    right_html = md.render(right_sanitized) if right_sanitized else right_sanitized
-
-    # Extract just the inner HTML content (remove surrounding <p> tags if present)
-    def extract_inner_html(html_content: str) -> str:
-        """Extract inner content from markdown-rendered HTML, removing wrapper tags."""
-        if html_content.startswith("<p>"):
-            html_content = html_content[3:]
-        # Remove </p> tag, handling both </p> and </p>
-
-        if html_content.endswith("</p>"):
-            html_content = html_content[:-4]
-        elif html_content.endswith("</p>\n"):
-            html_content = html_content[:-5]
-
-        return html_content.strip()
-
-    # Extract inner HTML and escape it to prevent XSS
-    # We escape AFTER markdown rendering to preserve markdown features like apostrophes
-    # Remove <p> tags first, then escape the content
-    left_inner = extract_inner_html(left_html) if left_sanitized else left_sanitized
-    middle_inner = (
-        extract_inner_html(middle_html) if middle_sanitized else middle_sanitized
-    )
-    right_inner = extract_inner_html(right_html) if right_sanitized else right_sanitized
-
-    left_content = _escape_html(left_inner) if left_sanitized else left_sanitized
-    middle_content = (
-        _escape_html(middle_inner) if middle_sanitized else middle_sanitized
-    )
-    right_content = _escape_html(right_inner) if right_sanitized else right_sanitized
-
-    # Build the HTML structure
-    html_parts = []
-
-    # Start the container
-    html_parts.append(
-        '<div class="userbox-container" style="display: inline-block; width: 185px; height: 45px; overflow: hidden; font-size: 12px; line-height: 1.2; border: 1px solid #aaa; border-radius: 2px;">'
-    )
-    html_parts.append('  <div style="display: flex; height: 100%;">')
-
-    # Add left section if provided
-    if left:
-        html_parts.append(
-            f'    <div class="userbox-left" style="background-color: {left_bg}; color: {left_fg};">{left_content}</div>'
-        )
-
-    # Add middle section (always present)
-    if left and right:
-        # Middle section between left and right
-        html_parts.append(
-            f'    <div class="userbox-middle" style="background-color: {middle_bg}; color: {middle_fg};">{middle_content}</div>'
-        )
-    elif left or right:
-        # Middle section expands to fill remaining space
-        html_parts.append(
-            f'    <div class="userbox-middle" style="background-color: {middle_bg}; color: {middle_fg};">{middle_content}</div>'
-        )
-    else:
-        # Only middle section (no left or right)
-        html_parts.append(
-            f'    <div class="userbox-middle" style="background-color: {middle_bg}; color: {middle_fg};">{middle_content}</div>'
-        )
-
-    # Add right section if provided
-    if right:
-        html_parts.append(
-            f'    <div class="userbox-right" style="background-color: {right_bg}; color: {right_fg};">{right_content}</div>'
-        )
-
-    # Close the container
-    html_parts.append("  </div>")
-    html_parts.append("</div>")
+# Userbox markup. The CSS contains braces, so only the section markup is a
+# str.format template; the container is joined around the rendered sections.
+_USERBOX_OPEN = (
+    '<div class="userbox-container" style="display: inline-block; width: 185px; height: 45px; overflow: hidden; font-size: 12px; line-height: 1.2; border: 1px solid #aaa; border-radius: 2px;">'
+    '\n  <div style="display: flex; height: 100%;">'
+)
+# Section colours used when the invocation doesn't set its own
+_USERBOX_DEFAULT_BG = "#f0f0f0"
+_USERBOX_DEFAULT_FG = "#000000"
+_USERBOX_SECTION = (
+    '    <div class="userbox-{position}" '
+    'style="background-color: {bg}; color: {fg};">{content}</div>'
+)
+_USERBOX_CLOSE = """  </div>
+</div>
 
-    # Add CSS for the userbox
-    html_parts.append("""
 <style>
 .userbox-left {
   width: 45px;
@@ -426,15 +308,152 @@ def _generate_userbox_html(params: Dict[str, str]) -> str:
   box-sizing: border-box;
   text-align: center;
 }
-</style>""")
+</style>"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_userbox_section(text: str) -> str:
+    """
+    Render the markdown for one section of a userbox.
+
+    The result depends only on the text, so it is cached; userboxes tend to
+    repeat the same few labels across many pages.
+
+    Args:
+        text: The markdown text of the section
+
+    Returns:
+        Escaped HTML for the section, without the wrapping <p> tag
+    """
+    # Sanitize the markdown content (but don't escape yet - we'll do that after markdown rendering)
+    # This allows markdown features like apostrophes to work correctly
+    sanitized = _sanitize_markdown_text(text)
+    if not sanitized:
+        return sanitized
+
+    # We use a simple markdown renderer for the userbox content
+    html_content = _USERBOX_MD.render(sanitized)
+
+    # Extract just the inner HTML content (remove surrounding <p> tags if present)
+    if html_content.startswith("<p>"):
+        html_content = html_content[3:]
+    if html_content.endswith("</p>"):
+        html_content = html_content[:-4]
+    elif html_content.endswith("</p>\n"):
+        html_content = html_content[:-5]
+
+    # Escape the inner HTML to prevent XSS
+    # We escape AFTER markdown rendering to preserve markdown features like apostrophes
+    return _escape_html(html_content.strip())
+
+
+def _generate_userbox_html(params: dict[str, str]) -> str:
+    """
+    Generate HTML for a userbox based on the provided parameters.
+
+    Args:
+        params: Dictionary of userbox parameters
+
+    Returns:
+        HTML string for the userbox
+    """
+    # Extract parameters with defaults
+    left = params.get("left", "")
+    middle = params.get("middle", "")
+    right = params.get("right", "")
+
+    left_bg = params.get("left-bg", _USERBOX_DEFAULT_BG)
+    left_fg = params.get("left-fg", _USERBOX_DEFAULT_FG)
+    middle_bg = params.get("middle-bg", _USERBOX_DEFAULT_BG)
+    middle_fg = params.get("middle-fg", _USERBOX_DEFAULT_FG)
+    right_bg = params.get("right-bg", _USERBOX_DEFAULT_BG)
+    right_fg = params.get("right-fg", _USERBOX_DEFAULT_FG)
+
+    # Render the markdown for each section
+    left_content = _render_userbox_section(left)
+    middle_content = _render_userbox_section(middle)
+    right_content = _render_userbox_section(right)
+
+    # Add the left and right sections if provided; the middle is always present
+    sections = []
+    if left:
+        sections.append(
+            _USERBOX_SECTION.format(
+                position="left", bg=left_bg, fg=left_fg, content=left_content
+            )
+        )
+    sections.append(
+        _USERBOX_SECTION.format(
+            position="middle", bg=middle_bg, fg=middle_fg, content=middle_content
+        )
+    )
+    if right:
+        sections.append(
+            _USERBOX_SECTION.format(
+                position="right", bg=right_bg, fg=right_fg, content=right_content
+            )
+        )
+
+    return "\n".join([_USERBOX_OPEN, *sections, _USERBOX_CLOSE])
+
+
+def _fetch_existing_pages(
+    links: Iterable[tuple[str, str]],
+) -> set[tuple[str, str]]:
+    """
+    Look up which of the given wiki link targets exist, in a single query.
+
+    Args:
+        links: (username, slug) pairs to check
+
+    Returns:
+        The subset of the pairs that name an existing page
+    """
+    links = set(links)
+    if not links:
+        return set()
+
+    usernames = {link_username for link_username, _ in links}
+    slugs = {slug for _, slug in links}
+    candidates = WikiPage.objects.filter(
+        author__username__in=usernames, slug__in=slugs
+    ).values_list("author__username", "slug")
+
+    return {pair for pair in candidates if pair in links}
+
+
+def _validate_wiki_links(tokens: list[Token]) -> None:
+    """
+    Set the validity class on every wiki link in a parsed token stream.
+
+    The existence checks for all links are batched into a single query
+    instead of one lookup per link.
 
-    return "\n".join(html_parts)
+    Args:
+        tokens: Block tokens returned by MarkdownIt.parse()
+    """
+    wiki_links = [
+        child
+        for token in tokens
+        if token.children
+        for child in token.children
+        if child.type == "link_open" and "wiki_link" in child.meta
+    ]
+
+    existing_pages = _fetch_existing_pages(
+        link.meta["wiki_link"] for link in wiki_links if link.meta["wiki_link"][0]
+    )
+
+    for link in wiki_links:
+        is_valid = link.meta["wiki_link"] in existing_pages
+        link.attrSet("class", "wiki-link-valid" if is_valid else "wiki-link-invalid")
 
 
 def wiki_link_plugin(
     md: MarkdownIt,
-    user_pages: Optional[Dict[str, str]] = None,
-    username: Optional[str] = None,
+    user_pages: dict[str, str] | None = None,
+    username: str | None = None,
+    defer_validation: bool = False,
 ) -> None:
     """
     Plugin to handle [[wiki-style]] links.
@@ -443,6 +462,11 @@ def wiki_link_plugin(
         md: The MarkdownIt instance
         user_pages: Optional dict mapping slugs to page titles for validation
         username: Optional username for cross-user link validation
+        defer_validation: If True, skip the per-link existence check and leave
+            it to _validate_wiki_links() on the parsed tokens
+
+    A "wiki_username" key in the parse env overrides username for that parse,
+    so a single parser instance can be shared across users.
     """
 
     def wiki_link_rule(state: StateInline, silent: bool) -> bool:
@@ -457,18 +481,14 @@ def wiki_link_plugin(
             True if a wiki link was found and processed, False otherwise
         """
         # Check if we're at [[
-        if state.src[state.pos : state.pos + 2] != "[[":
+        if not state.src.startswith("[[", state.pos):
             return False
 
         start = state.pos
-        pos = start + 2
 
         # Find closing ]]
-        while pos < len(state.src) - 1:
-            if state.src[pos : pos + 2] == "]]":
-                break
-            pos += 1
-        else:
+        pos = state.src.find("]]", start + 2)
+        if pos == -1:
             return False  # No closing bracket found
 
         content = state.src[start + 2 : pos]
@@ -503,9 +523,15 @@ def wiki_link_plugin(
 
             # Check if the page exists for validation
             is_valid = False
-            validation_username = target_username if cross_user else username
+            validation_username = (
+                target_username
+                if cross_user
+                else state.env.get("wiki_username", username)
+            )
 
-            if validation_username:
+            if defer_validation:
+                pass
+            elif validation_username:
                 # Check if this user has a page with the target slug
                 try:
                     target_user = UserModel.objects.get(username=validation_username)
@@ -523,6 +549,7 @@ def wiki_link_plugin(
             token = state.push("link_open", "a", 1)
             token.attrSet("href", f"/{target_slug}.html")
             token.attrSet("data-wiki-link", target_slug)
+            token.meta["wiki_link"] = (validation_username or "", target_slug)
 
             if cross_user and target_username:
                 token.attrSet("data-wiki-username", target_username)
@@ -545,9 +572,13 @@ def wiki_link_plugin(
     md.inline.ruler.before("link", "wiki_link", wiki_link_rule)
 
 
-def render_markdown_with_wiki_links(
-    content: str, username: Optional[str] = None
-) -> str:
+# Parsers are built once and shared; markdown-it keeps all per-document state
+# in the parse env and token stream, not on the instance.
+_WIKI_MD = MarkdownIt().use(wiki_link_plugin, defer_validation=True)
+_USERBOX_MD = MarkdownIt()
+
+
+def render_markdown_with_wiki_links(content: str, username: str | None = None) -> str:
     """
     Render markdown content with wiki link support.
 
@@ -567,35 +598,35 @@ def render_markdown_with_wiki_links(
     # We need to do this before markdown processing so that wiki links
     # inside templates are also processed
 
+    pages: dict[str, WikiPage | None] = {}
+
     def resolve_templates(match: re.Match) -> str:
         template_name = match.group(1).strip()
         params_str = match.group(2) if match.group(2) else ""
         params = _parse_template_params(params_str)
 
-        resolved = _resolve_template_content(template_name, params, username)
+        resolved = _resolve_template_content(
+            template_name, params, username, pages=pages
+        )
         return resolved if resolved is not None else match.group(0)
 
-    # Resolve templates in the content
-    content_sanitized = re.sub(
-        r"\{\{([^|\}]+)(?:\|([^}]*))?\}\}", resolve_templates, content_sanitized
-    )
-
-    # Then process with markdown
-    md = MarkdownIt()
-
-    # If username is provided, load all pages by that user for validation
-    user_pages = None
-    if username:
-        try:
-            user = UserModel.objects.get(username=username)
-            pages = WikiPage.objects.filter(author=user)
-            user_pages = {page.slug: page.title for page in pages}
-        except UserModel.DoesNotExist:
-            user_pages = {}
-
-    # Apply the wiki link plugin
-    md.use(lambda m: wiki_link_plugin(m, user_pages, username))
-
-    result = md.render(content_sanitized)
+    # Resolve templates in the content. Templates are only resolved for
+    # existing users, and all top-level templates are fetched in one query.
+    # Most content has no templates at all, so skip the scan when it can't match.
+    if "{{" in content_sanitized:
+        template_names = _template_names(content_sanitized)
+        if template_names and (
+            not username or UserModel.objects.filter(username=username).exists()
+        ):
+            _load_template_pages(template_names, pages)
+            content_sanitized = _TEMPLATE_RE.sub(resolve_templates, content_sanitized)
+
+    # Then process with markdown, validating all links in one query after parsing
+    env: dict = {"wiki_username": username}
+    tokens = _WIKI_MD.parse(content_sanitized, env)
+    if "[[" in content_sanitized:
+        _validate_wiki_links(tokens)
+
+    result = _WIKI_MD.renderer.render(tokens, _WIKI_MD.options, env)
     assert isinstance(result, str)
     return result
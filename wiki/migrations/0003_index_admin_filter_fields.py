@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wiki", "0002_follow"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="wikipage",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="pagerevision",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="pagerevision",
+            name="is_current",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="useractivity",
+            name="activity_type",
+            field=models.CharField(
+                choices=[
+                    ("create_page", "Created Page"),
+                    ("edit_page", "Edited Page"),
+                    ("delete_page", "Deleted Page"),
+                    ("login", "Logged In"),
+                    ("signup", "Signed Up"),
+                ],
+                db_index=True,
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="useractivity",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -13,7 +13,7 @@ class WikiPage(models.Model):
     slug = models.SlugField(max_length=200, unique=True)
     content = models.TextField()
     author = models.ForeignKey(User, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -54,8 +54,8 @@ class PageRevision(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     editor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    is_current = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    is_current = models.BooleanField(default=False, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -79,10 +79,12 @@ class UserActivity(models.Model):
     ]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="activities")
-    activity_type = models.CharField(max_length=20, choices=ACTIVITY_TYPES)
+    activity_type = models.CharField(
+        max_length=20, choices=ACTIVITY_TYPES, db_index=True
+    )
     page = models.ForeignKey(WikiPage, on_delete=models.SET_NULL, null=True, blank=True)
     details = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
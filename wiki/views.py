@@ -31,7 +31,7 @@ def _get_authenticated_user(request: HttpRequest) -> User:
 
 def home(request: HttpRequest) -> HttpResponse:
     """Home page showing recent wiki pages"""
-    pages = WikiPage.objects.all().order_by("-created_at")[:10]
+    pages = WikiPage.objects.select_related("author").order_by("-created_at")[:10]
     return render(request, "wiki/home.html", {"pages": pages})
 
 
@@ -231,7 +231,9 @@ def view_wiki_page(request: HttpRequest, username: str, page_slug: str) -> HttpR
         raise Http404(f'User "{username}" does not exist')
 
     try:
-        page = WikiPage.objects.get(author=user, slug=page_slug)
+        page = WikiPage.objects.select_related("author").get(
+            author=user, slug=page_slug
+        )
     except WikiPage.DoesNotExist:
         raise Http404(f'Page "{page_slug}" does not exist for user "{username}"')
 
@@ -256,7 +258,11 @@ def view_revisions(request: HttpRequest, page_id: int) -> HttpResponse:
         messages.error(request, "You can only view revisions of your own pages.")
         return redirect("user_profile", username=user.username)
 
-    revisions = PageRevision.objects.filter(page=page).order_by("-created_at")
+    revisions = (
+        PageRevision.objects.filter(page=page)
+        .select_related("editor")
+        .order_by("-created_at")
+    )
 
     return render(
         request, "wiki/revisions.html", {"page": page, "revisions": revisions}
@@ -319,7 +325,11 @@ def user_activity(request: HttpRequest, username: str) -> HttpResponse:
     user = User.objects.get(username=username)
 
     # Get user's activity
-    activities = UserActivity.objects.filter(user=user).order_by("-created_at")
+    activities = (
+        UserActivity.objects.filter(user=user)
+        .select_related("page__author")
+        .order_by("-created_at")
+    )
 
     return render(
         request, "wiki/activity.html", {"profile_user": user, "activities": activities}